@@ -27,9 +27,12 @@
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import missingno as msno
 from collections import Counter
 import warnings
+from dune_sales import plots, quality
+from dune_sales.aggregates import Cube
+from dune_sales.load import load_raw
+from dune_sales.timeseries import DailySeries
 warnings.filterwarnings('ignore')
 
 
@@ -38,7 +41,8 @@ warnings.filterwarnings('ignore')
 # In[2]:
 
 
-df = pd.read_csv(R"C:\Users\Mumsie\Downloads\Dune Sales Data.csv")
+# The path defaults to the bundled export and can be overridden with $DUNE_SALES_CSV
+df = load_raw()
 df.head()
 
 
@@ -81,7 +85,7 @@ df.describe()
 
 
 # Categorical Statistical Analysis
-df.describe(include = ['object', 'bool'])
+df.describe(include = ['category', 'bool'])
 
 
 # Next, I will investigate the missing data
@@ -89,7 +93,10 @@ df.describe(include = ['object', 'bool'])
 # In[9]:
 
 
-df.isnull().sum()
+# One pass over the file: null counts, null density per block of rows, invalid
+# categories, out-of-range values and rows where cost exceeds price
+quality_report = quality.scan()
+quality_report.nulls
 
 
 # In[10]:
@@ -97,22 +104,24 @@ df.isnull().sum()
 
 # Visualizing the missing data
 
+print(quality_report)
 plt.figure(figsize = (8,4))
-sns.heatmap(df.isnull(), cbar=True, cmap='coolwarm');
+plots.null_profile(quality_report.null_profile);
 
 
 # In[11]:
 
 
-msno.bar(df, color='blue');
+plots.bars(quality_report.rows - quality_report.nulls, label=True, title='Non-null values per column');
 
 
 # In[12]:
 
 
-# Displaying where the missing data exists
+# Displaying where the missing data exists (the scan keeps example row labels)
 
-df[df.isnull().any(axis=1)]
+print(quality_report.incomplete_rows, 'incomplete rows, for example:')
+df.loc[quality_report.examples.get('incomplete rows', [])]
 
 
 # Next, I will drop the missing data
@@ -121,7 +130,10 @@ df[df.isnull().any(axis=1)]
 
 
 df.dropna(inplace=True)
-df.isnull().sum()
+
+# Exactly the incomplete rows counted by the scan are gone
+assert len(df) == quality_report.rows - quality_report.incomplete_rows
+df.shape
 
 
 # In[14]:
@@ -136,7 +148,7 @@ df.head(2)
 # In[24]:
 
 
-df['Date'] = pd.to_datetime(df['Date'])
+df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%y')
 df.info()
 
 
@@ -251,11 +263,11 @@ df['Customer'].value_counts()
 # In[35]:
 
 
+# One pass over the cleaned frame answers every count and total below
+cube = Cube.from_frame(df)
+
 plt.figure(figsize = (8,5))
-ax = sns.countplot(x=df['Sales Person'], order=df['Sales Person'].value_counts(ascending=False).index)
-values = df['Sales Person'].value_counts(ascending=False).values
-ax.bar_label(container=ax.containers[0], labels=values)
-plt.title('Count of transactions by salesperson');
+plots.count_bars(cube.value_counts('Sales Person'), title='Count of transactions by salesperson');
 
 
 # > The countplot represents the number of transactions carried out by each salesperson.
@@ -271,10 +283,8 @@ plt.title('Count of transactions by salesperson');
 
 plt.figure(figsize = (15,5))
 
-ax = sns.countplot(y=df['age_group'], order=df['age_group'].value_counts(ascending=False).index)
-values = df['age_group'].value_counts(ascending=False).values
-ax.bar_label(container=ax.containers[0], labels=values)
-plt.title('Count of transactions by Customer Age Group');
+plots.count_bars(cube.value_counts('age_group'), horizontal=True,
+                 title='Count of transactions by Customer Age Group');
 
 
 # > The countplot titled "Count of transactions by Customer Age Group" visually represents the distribution of transactions among different age groups of customers. The age groups are divided into four categories:
@@ -309,9 +319,8 @@ plt.show();
 
 
 plt.figure(figsize=(12,5))
-top10 = df['State'].value_counts().head(10)
-sns.countplot(x=df['State'], order=top10.index)
-plt.title('Top 10 transactions by State');
+top10 = cube.value_counts('State').head(10)
+plots.count_bars(top10, label=False, title='Top 10 transactions by State');
 
 print(top10)
 
@@ -328,10 +337,8 @@ print(top10)
 
 plt.figure(figsize = (13,5))
 
-ax = sns.countplot(y=df['Sub_Category'], order=df['Sub_Category'].value_counts(ascending=False).index)
-values = df['Sub_Category'].value_counts(ascending=False).values
-ax.bar_label(container=ax.containers[0], labels=values)
-plt.title('Count of transactions by Sub Category');
+plots.count_bars(cube.value_counts('Sub_Category'), horizontal=True,
+                 title='Count of transactions by Sub Category');
 
 
 # > The bar chart provides a visual representation of the distribution of transactions across different sub-categories of products. It focuses on identifying which sub-categories are the most popular among customers. The sub-category "Keyboard" stands out as the most popular among customers, with approximately 11,112 transactions. "Ear Piece" and "Wrist Watch" follow, with 5,295 and 4,176 transactions, respectively. Other sub-categories like "Samsung," "IPhone," and "Jerseys" also have a significant number of transactions.
@@ -377,13 +384,11 @@ print(po)
 # In[69]:
 
 
+months = cube.value_counts('month_name')
 plt.figure(figsize = (12,5))
-ax = sns.countplot(x=df['month_name'], order=df['month_name'].value_counts(ascending=False).index)
-values = df['month_name'].value_counts(ascending=False).values
-ax.bar_label(container=ax.containers[0], labels=values)
-plt.title('Count of Transactions by Month');
+plots.count_bars(months, title='Count of Transactions by Month');
 
-df['month_name'].value_counts()
+months
 
 
 # > This bar chart provides insights into the distribution of transactions across different months.
@@ -484,29 +489,15 @@ df.columns
 
 fig, axs = plt.subplots(2,3, figsize = (27,10))
 
-cust_prof = df.groupby('Customer')['profit'].sum().reset_index()
-sns.barplot(x='Customer', data=cust_prof, y='profit', ax=axs[0,0])
-axs[0,0].set_title('Profit by Customer Type')
-
-sp_prof = df.groupby('Sales Person')['profit'].sum().reset_index()
-sns.barplot(x='Sales Person', data = sp_prof, y='profit', ax=axs[0,1])
-axs[0,1].set_title('Profit by Sales Person')
-
-ag_prof = df.groupby('age_group')['profit'].sum().reset_index()
-sns.barplot(x='age_group', data = ag_prof, y='profit', ax=axs[0,2])
-axs[0,2].set_title('Profit by Age Group')
-
-pc_prof = df.groupby('Product_Category')['profit'].sum().reset_index()
-sns.barplot(y='Product_Category', data=pc_prof, x='profit', ax=axs[1,0])
-axs[1,0].set_title('Profit by Product Category')
-
-po_prof = df.groupby('Payment Option')['profit'].sum().reset_index()
-sns.barplot(y='Payment Option', data=po_prof, x='profit', ax=axs[1,1])
-axs[1,1].set_title('Profit by Payment Option')
-
-sc_prof = df.groupby('Sub_Category')['profit'].sum().reset_index()
-sns.barplot(y='Sub_Category', data=sc_prof, x='profit', ax=axs[1,2])
-axs[1,2].set_title('Profit by Sub-Category');
+plots.bars(cube.total('Customer'), ax=axs[0,0], title='Profit by Customer Type')
+plots.bars(cube.total('Sales Person'), ax=axs[0,1], title='Profit by Sales Person')
+plots.bars(cube.total('age_group'), ax=axs[0,2], title='Profit by Age Group')
+plots.bars(cube.total('Product_Category'), ax=axs[1,0], horizontal=True,
+           title='Profit by Product Category')
+plots.bars(cube.total('Payment Option'), ax=axs[1,1], horizontal=True,
+           title='Profit by Payment Option')
+plots.bars(cube.total('Sub_Category'), ax=axs[1,2], horizontal=True,
+           title='Profit by Sub-Category');
 
 
 # > **Profit by Customer Type (Top Left):**
@@ -557,7 +548,7 @@ axs[0,1].set_title('Profit by Product Category')
 sns.boxplot(x='age_group', data=df, y='profit', ax=axs[1,0])
 axs[1,0].set_title('Profit by Age Group')
 
-sns.scatterplot(x=df['Customer_Age'], y=df['profit'], ax=axs[1,1])
+plots.scatter(df, 'Customer_Age', 'profit', ax=axs[1,1])
 axs[1,1].set_title('Relationship between Customer Age and Profit');
 
 
@@ -614,8 +605,9 @@ plt.title('Product Category by Cost, Revenue, and Profit');
 # In[83]:
 
 
+trend = DailySeries.from_frame(df)
 plt.figure(figsize = (15,5))
-sns.lineplot(x='month', y='profit', data=df, hue='year');
+plots.lines(trend.pivot('profit', how='mean'), ax=plt.gca());
 
 
 # > In 2015, the line chart shows a period of recorded loss that occurs between February and June. During this period, the data points dip below zero, indicating that the company experienced a loss. However, starting from July, there is a notable shift, and the company transitions into a profit-making phase.
@@ -627,7 +619,7 @@ sns.lineplot(x='month', y='profit', data=df, hue='year');
 # In[84]:
 
 
-df.pivot_table(values='profit', index='year', columns='month', aggfunc='sum')
+trend.pivot('profit')
 
 
 # > The line chart and pivot table provide valuable insights into the profitability trends over two years, 2015 and 2016:
@@ -645,8 +637,9 @@ df.pivot_table(values='profit', index='year', columns='month', aggfunc='sum')
 # In[87]:
 
 
+# Mean profit per transaction (seaborn's estimator), without the per-row bootstrap
 plt.figure(figsize = (10,5))
-sns.barplot(x='Customer_Gender', y='profit', data=df, hue='age_group');
+plots.bars(cube.mean('Customer_Gender', 'age_group').unstack('age_group'));
 
 
 # Next, I will create a pivot table to observe the numbers:
@@ -654,7 +647,7 @@ sns.barplot(x='Customer_Gender', y='profit', data=df, hue='age_group');
 # In[90]:
 
 
-df.pivot_table(values='profit', index='age_group', columns='Customer_Gender', aggfunc='sum')
+cube.pivot('age_group', 'Customer_Gender')
 
 
 # > The barplot visualization presents a multivariate analysis of customer gender, age group, and their respective contributions to profit. 
@@ -721,7 +714,7 @@ sns.heatmap(a, vmax=.8, square=True, annot=True);
 
 # Vizualisation using pairplot
 
-sns.pairplot(df, height=2.5);
+plots.pairplot(df, height=2.5);
 
 
 # > The pairplot allows for exploration of the relationships between multiple (numeric variables) in the dataset by displaying scatterplots for pairs of variables and histograms for individual variables along the diagonal. 
@@ -0,0 +1,65 @@
+"""Cross-backend benchmark and conformance check (pandas / Polars / Arrow).
+
+Every installed backend loads and enriches the export, then runs each
+analysis in :data:`dune_sales.backends.ANALYSES`; the best of ``--repeat``
+timings is reported.  Results are then compared with the pandas
+reference and the exit status is 1 if any backend disagrees.
+
+    python benchmarks/bench_backends.py [--path FILE] [--backends pandas polars arrow]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.backends import ANALYSES, available_backends, conformance, get_backend  # noqa: E402
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    parser.add_argument("--backends", nargs="+", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    names = args.backends or available_backends()
+    timings = {}
+    for name in names:
+        backend = get_backend(name)
+        column = {"load + enrich": _best(lambda: backend.load(args.path), 1)}
+        for analysis, fn in ANALYSES.items():
+            column[analysis] = _best(lambda: fn(backend), args.repeat)
+        timings[name] = column
+        print(f"{name}: {backend.rows:,} rows")
+
+    table = pd.DataFrame(timings) * 1e3
+    table.loc["total"] = table.sum()
+    print("\nmilliseconds (best of %d)" % args.repeat)
+    print(table.to_string(float_format="{:,.2f}".format))
+
+    checks = conformance(args.path, names)
+    failed = checks[~checks["ok"]]
+    print(f"\nconformance: {checks['ok'].sum()}/{len(checks)} checks match pandas")
+    if len(failed):
+        print(failed.to_string(index=False))
+    return 1 if len(failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Compare the notebook's row-wise ``age_group``/``porl`` with the vectorized bands.
+
+    python benchmarks/bench_features.py [--rows N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dune_sales.features import age_bands, profit_labels  # noqa: E402
+
+
+# The notebook's original per-row functions, kept verbatim as the reference.
+def age_group(age):
+    if age <= 25:
+        return '<=25 Young Adult'
+    elif age <= 40:
+        return '26-40 Adult'
+    elif age <= 50:
+        return '41-50 Old Adult'
+    else:
+        return '>=51 Elder'
+
+
+def porl(x):
+    if x >= 0:
+        return 'Profit'
+    else:
+        return 'Loss'
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    ages = pd.Series(rng.integers(17, 88, args.rows), dtype="int8")
+    profit = pd.Series(rng.normal(40, 120, args.rows)).astype("float32")
+
+    cases = [
+        ("age_group", lambda: ages.apply(age_group), lambda: age_bands(ages)),
+        ("profit_label", lambda: profit.apply(porl), lambda: profit_labels(profit)),
+    ]
+    print(f"{'column':<14} {'apply s':>9} {'vector s':>9} {'speedup':>8}")
+    for name, slow, fast in cases:
+        t_slow, expected = best_of(slow, args.repeat)
+        t_fast, actual = best_of(fast, args.repeat)
+        if not actual.astype(object).equals(expected):
+            raise AssertionError(f"{name}: vectorized labels differ from .apply")
+        print(f"{name:<14} {t_slow:>9.3f} {t_fast:>9.3f} {t_slow / t_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Filtered breakdowns: boolean masks on the frame vs the bitmap index.
+
+    python benchmarks/bench_index.py [--path FILE] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.bitmap import BitmapIndex  # noqa: E402
+from dune_sales.features import enrich  # noqa: E402
+from dune_sales.load import load_sales  # noqa: E402
+
+MEASURES = ['cost', 'revenue', 'profit']
+
+
+def _mask(df: pd.DataFrame, filters: dict) -> pd.Series:
+    mask = pd.Series(True, index=df.index)
+    for col, value in filters.items():
+        mask &= df[col].isin(value) if isinstance(value, list) else df[col] == value
+    return mask
+
+
+def queries(df: pd.DataFrame) -> list[tuple[str, dict, str | None]]:
+    """(description, filters, group-by) cases drawn from the data's most common labels."""
+    state = df['State'].value_counts().index[0]
+    person = df['Sales Person'].value_counts().index[0]
+    category = df['Product_Category'].value_counts().index[0]
+    year = int(df['year'].mode()[0])
+    return [
+        ("one state", {'State': state}, None),
+        ("state x year", {'State': state, 'year': year}, None),
+        ("person x quarters", {'Sales Person': person, 'quarter': [1, 2]}, None),
+        ("state x category by payment", {'State': state, 'Product_Category': category}, 'Payment Option'),
+    ]
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = enrich(load_sales(args.path))
+    start = time.perf_counter()
+    index = BitmapIndex.build(df)
+    print(f"{len(df):,} rows; index built in {time.perf_counter() - start:.3f}s, "
+          f"{index.nbytes / 2**20:,.1f} MiB of bitmaps\n")
+
+    print(f"{'query':32} {'mask':>10} {'index':>10} {'speedup':>8}")
+    for name, filters, by in queries(df):
+        if by is None:
+            def masked():
+                return df.loc[_mask(df, filters), MEASURES].sum()
+        else:
+            def masked():
+                return df.loc[_mask(df, filters)].groupby(by, observed=True)[MEASURES].sum()
+
+        def indexed():
+            return index.aggregate(by=by, measures=MEASURES, **filters)
+
+        expected, got = masked(), indexed()
+        if by is None:
+            assert np.allclose(expected.to_numpy(float), got[MEASURES].to_numpy(float)), name
+        else:
+            assert np.allclose(expected.to_numpy(float), got[MEASURES].loc[expected.index].to_numpy(float)), name
+        t_mask, t_index = _best(masked, args.repeat), _best(indexed, args.repeat)
+        print(f"{name:32} {t_mask * 1e3:9.2f}ms {t_index * 1e3:9.2f}ms {t_mask / t_index:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the notebook's single ``pd.read_csv`` with the chunked loader.
+
+Each variant runs in a fresh interpreter so that ``ru_maxrss`` reflects
+only that variant's peak resident set size.
+
+    python benchmarks/bench_load.py [--path FILE] [--chunksize N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+VARIANTS = {
+    # What the notebook does today.
+    "read_csv": (
+        "import pandas as pd\n"
+        "df = pd.read_csv(path)\n"
+        "rows = len(df.dropna())\n"
+    ),
+    # Stream the file and fold each chunk away; peak RSS should be flat.
+    "iter_chunks": (
+        "from dune_sales.load import iter_chunks\n"
+        "rows = sum(len(c) for c in iter_chunks(path, chunksize))\n"
+    ),
+    # Typed chunks concatenated into one resident frame.
+    "load_sales": (
+        "from dune_sales.load import load_sales\n"
+        "rows = len(load_sales(path, chunksize))\n"
+    ),
+}
+
+HARNESS = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+path, chunksize = {path!r}, {chunksize!r}
+t0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - t0
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"rows": rows, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024}}))
+"""
+
+
+def run_variant(name: str, path: str, chunksize: int) -> dict:
+    code = HARNESS.format(root=str(ROOT), path=path, chunksize=chunksize,
+                          body=VARIANTS[name])
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    return {"variant": name, **json.loads(out.strip().splitlines()[-1])}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'variant':<12} {'rows':>10} {'best s':>8} {'peak MB':>9}")
+    for name in VARIANTS:
+        runs = [run_variant(name, args.path, args.chunksize) for _ in range(args.repeat)]
+        best = min(r["seconds"] for r in runs)
+        peak = max(r["peak_rss_mb"] for r in runs)
+        print(f"{name:<12} {runs[0]['rows']:>10} {best:>8.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
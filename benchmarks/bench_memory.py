@@ -0,0 +1,58 @@
+"""Memory of the enriched frame: the notebook's representation vs the compact schema.
+
+    python benchmarks/bench_memory.py [--path FILE]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.compact import compact  # noqa: E402
+from dune_sales.features import enrich  # noqa: E402
+from dune_sales.load import load_sales  # noqa: E402
+
+from bench_features import age_group, porl  # noqa: E402
+
+
+def notebook_frame(path: str) -> pd.DataFrame:
+    """The enriched frame exactly as the notebook builds it."""
+    df = pd.read_csv(path).dropna()
+    df['Date'] = pd.to_datetime(df['Date'], format='%d-%b-%y')
+    df['year'] = df['Date'].dt.year
+    df['month'] = df['Date'].dt.month
+    df['month_name'] = df['Date'].dt.month_name()
+    df['quarter'] = df['Date'].dt.quarter
+    df['age_group'] = df['Customer_Age'].apply(age_group)
+    df['cost'] = df['Quantity'] * df['Unit_Cost']
+    df['revenue'] = df['Quantity'] * df['Unit_Price']
+    df['profit'] = df['revenue'] - df['cost']
+    df['profit_label'] = df['profit'].apply(porl)
+    df.loc[df['Customer'] == 'Hign', 'Customer'] = 'High'
+    return df
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    args = parser.parse_args(argv)
+
+    original = notebook_frame(args.path)
+    _, report = compact(original)
+    print("notebook frame -> compact schema")
+    print(report)
+
+    pipeline = enrich(load_sales(args.path))
+    small, _ = compact(pipeline)
+    ratio = report.before / small.sales.memory()
+    print(f"\npipeline frame after compact: {small.sales.memory() / 2**20:,.1f} MiB "
+          f"({ratio:.1f}x smaller than the notebook frame; target >= 4x)")
+
+
+if __name__ == "__main__":
+    main()
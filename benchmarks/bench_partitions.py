@@ -0,0 +1,57 @@
+"""Scaling benchmark for partitioned aggregation across 1/2/4/8 workers.
+
+Without ``--sources`` the bundled export is split into one file per State
+(optionally repeated ``--copies`` times to add volume) in a temporary
+directory.
+
+    python benchmarks/bench_partitions.py [--sources DIR_OR_GLOB] [--copies N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.partition import aggregate_partitions  # noqa: E402
+
+
+def split_by_state(target: Path, copies: int) -> Path:
+    df = pd.read_csv(ROOT / "Dune Sales Data.csv")
+    df = pd.concat([df] * copies, ignore_index=True)
+    for state, part in df.groupby("State"):
+        part.to_csv(target / f"{state.replace(' ', '_')}.csv", index=False)
+    return target
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources")
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = args.sources or split_by_state(Path(tmp), args.copies)
+        baseline, base_time = None, None
+        print(f"{'workers':>7} {'seconds':>9} {'speedup':>8}")
+        for n in args.workers:
+            t0 = time.perf_counter()
+            cube = aggregate_partitions(sources, workers=n)
+            elapsed = time.perf_counter() - t0
+            full = cube.rollup(*cube.dims, extrema=True)
+            if baseline is None:
+                baseline, base_time = full, elapsed
+            else:
+                pd.testing.assert_frame_equal(full, baseline, check_exact=True)
+            print(f"{n:>7} {elapsed:>9.3f} {base_time / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Lazy plans with pushdown vs the eager load → enrich → filter pipeline.
+
+Every case is checked for identical results before it is timed, including
+a filter on a column with known value fixes (``Customer == "High"`` must
+also match the ``Hign`` typo rows) and a two-key grouping, which must not
+return unobserved label combinations.
+
+    python benchmarks/bench_plan.py [--path FILE] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.features import enrich  # noqa: E402
+from dune_sales.load import load_sales  # noqa: E402
+from dune_sales.plan import scan  # noqa: E402
+
+CASES = {
+    "Customer == High": ({'Customer': 'High'}, None),
+    "Lagos 2016 by payment": ({'State': 'Lagos', 'year': 2016}, ('Payment Option',)),
+    "High by sub-category": ({'Customer': 'High'}, ('Sub_Category',)),
+    "state x sales person": ({}, ('State', 'Sales Person')),
+}
+
+
+def eager(path: str, filters: dict, by: tuple | None) -> pd.DataFrame | int:
+    df = enrich(load_sales(path))
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in filters.items():
+        mask &= (df[col] == value).to_numpy()
+    df = df[mask]
+    if by is None:
+        return len(df)
+    return df.groupby(list(by), observed=True)['profit'].agg(profit='sum', n='count')
+
+
+def lazy(path: str, filters: dict, by: tuple | None) -> pd.DataFrame | int:
+    query = scan(path).filter(**filters)
+    if by is None:
+        return len(query.select('Customer').collect())
+    return query.groupby(*by).agg(profit='sum', n=('profit', 'count')).collect()
+
+
+def _keyed(table: pd.DataFrame) -> pd.DataFrame:
+    """Group keys as plain strings, rows sorted, so categorical and object keys compare."""
+    flat = table.reset_index()
+    keys = list(table.index.names)
+    flat[keys] = flat[keys].astype(str)
+    return flat.sort_values(keys, ignore_index=True)
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':26} {'eager':>10} {'lazy':>10} {'speedup':>8}")
+    for name, (filters, by) in CASES.items():
+        expected, got = eager(args.path, filters, by), lazy(args.path, filters, by)
+        if by is None:
+            assert got == expected, f"{name}: {got} rows, eager pipeline has {expected}"
+        else:
+            got, expected = _keyed(got), _keyed(expected)
+            assert len(got) == len(expected), \
+                f"{name}: {len(got)} groups, eager pipeline has {len(expected)}"
+            keys = list(by)
+            assert got[keys].equals(expected[keys]), name
+            assert (got['n'].to_numpy() == expected['n'].to_numpy()).all(), name
+            assert np.allclose(got['profit'], expected['profit']), name
+        t_eager = _best(lambda: eager(args.path, filters, by), args.repeat)
+        t_lazy = _best(lambda: lazy(args.path, filters, by), args.repeat)
+        print(f"{name:26} {t_eager:9.3f}s {t_lazy:9.3f}s {t_eager / t_lazy:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
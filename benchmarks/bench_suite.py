@@ -0,0 +1,105 @@
+"""Full-pipeline benchmark on synthetic exports scaled from the real CSV.
+
+For each ``--sizes`` entry a synthetic export is generated once (and kept
+in ``--data-dir``), then ingest, cleaning, date parsing, derivation, every
+aggregation and the HTML report are timed stage by stage.  Results are
+compared with ``baselines.json`` next to this script; ``--save-baseline``
+records the current run instead.  The exit status is 1 when a stage is
+slower than its baseline by more than ``--tolerance``.
+
+    python benchmarks/bench_suite.py --sizes 1M 10M [--save-baseline]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.aggregates import Cube  # noqa: E402
+from dune_sales.cache import resolve_cache_dir  # noqa: E402
+from dune_sales.partition import aggregate_partitions  # noqa: E402
+from dune_sales.profiling import Profiler, profile_pipeline  # noqa: E402
+from dune_sales.report import render_report  # noqa: E402
+from dune_sales.synthetic import SalesModel, parse_rows  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+#: Stages faster than this are too noisy to flag as regressions.
+MIN_SECONDS = 0.05
+
+
+def dataset(model: SalesModel | None, data_dir: Path, size: str,
+            seed: int) -> tuple[SalesModel | None, Path]:
+    """Path of the synthetic export for *size*, generating it (and fitting *model*) if missing."""
+    path = data_dir / f"sales_{size}_seed{seed}.csv"
+    if not path.exists():
+        model = model or SalesModel.fit_file()
+        print(f"generating {size} rows -> {path}")
+        model.write_csv(path, parse_rows(size), seed)
+    return model, path
+
+
+def run(path: Path, workers: int | None) -> Profiler:
+    prof = profile_pipeline(path)
+    with prof.stage("aggregate cube (partitioned)") as rec:
+        cube: Cube = aggregate_partitions(str(path), workers=workers)
+        rec.rows = cube.rows
+    with tempfile.TemporaryDirectory() as out:
+        with prof.stage("report"):
+            render_report(cube, out, workers=workers)
+    return prof
+
+
+def compare(size: str, stages: dict[str, float], baseline: dict[str, float],
+            tolerance: float) -> bool:
+    print(f"\n{size}: {'stage':40} {'now s':>9} {'base s':>9} {'ratio':>7}")
+    ok = True
+    for name, wall in stages.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{'':{len(size) + 2}}{name:40} {wall:9.3f} {'-':>9} {'-':>7}")
+            continue
+        ratio = wall / base if base else float("inf")
+        slow = ratio > 1 + tolerance and wall > MIN_SECONDS
+        ok &= not slow
+        flag = "  SLOWER" if slow else ""
+        print(f"{'':{len(size) + 2}}{name:40} {wall:9.3f} {base:9.3f} {ratio:6.2f}x{flag}")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1M"], help="e.g. 1M 10M 100M")
+    parser.add_argument("--data-dir", default=str(resolve_cache_dir() / "synthetic"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.data_dir)
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    model, ok = None, True
+    for size in args.sizes:
+        model, path = dataset(model, data_dir, size, args.seed)
+        prof = run(path, args.workers)
+        print(f"\n{size} rows ({path.name})\n{prof.table()}")
+        stages = {r.name: r.wall for r in prof.records}
+        if args.save_baseline:
+            baselines[size] = stages
+        elif size in baselines:
+            ok &= compare(size, stages, baselines[size], args.tolerance)
+
+    if args.save_baseline:
+        BASELINES.write_text(json.dumps(baselines, indent=1, sort_keys=True))
+        print(f"\nsaved baselines for {', '.join(args.sizes)} to {BASELINES}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Trend tables: regrouping the frame vs rolling up the daily series.
+
+Also checks that a series merged from chunks with disjoint label sets
+(one chunk per half of the states) equals the one built in a single pass.
+
+    python benchmarks/bench_timeseries.py [--path FILE] [--dim State] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dune_sales.features import enrich  # noqa: E402
+from dune_sales.load import load_sales  # noqa: E402
+from dune_sales.timeseries import DailySeries  # noqa: E402
+
+
+def check_disjoint_merge(df: pd.DataFrame, dim: str) -> None:
+    labels = df[dim].dropna().unique()
+    half = set(labels[: len(labels) // 2])
+    left, right = df[df[dim].isin(half)], df[~df[dim].isin(half)]
+    merged = DailySeries.from_chunks([left, right], dim=dim)
+    single = DailySeries.from_frame(df, dim=dim)
+    expected = single.rollup("D", "profit")
+    got = merged.rollup("D", "profit").reindex(index=expected.index, columns=expected.columns)
+    assert np.allclose(got.to_numpy(), expected.to_numpy()), "disjoint-label merge differs"
+    print(f"merge of disjoint {dim} label sets matches the single pass")
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default=str(ROOT / "Dune Sales Data.csv"))
+    parser.add_argument("--dim", default="State")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = enrich(load_sales(args.path))
+    check_disjoint_merge(df, args.dim)
+
+    trend = DailySeries.from_frame(df)
+    expected = df.pivot_table(values='profit', index='year', columns='month', aggfunc='sum')
+    got = trend.pivot('profit').reindex(index=expected.index, columns=expected.columns)
+    assert np.allclose(got.to_numpy(float), expected.to_numpy(float), equal_nan=True)
+
+    t_frame = _best(lambda: df.pivot_table(values='profit', index='year', columns='month',
+                                           aggfunc='sum'), args.repeat)
+    t_build = _best(lambda: DailySeries.from_frame(df), args.repeat)
+    t_series = _best(lambda: trend.pivot('profit'), args.repeat)
+    print(f"pivot_table on rows: {t_frame * 1e3:8.2f}ms")
+    print(f"daily series build:  {t_build * 1e3:8.2f}ms (once)")
+    print(f"pivot from series:   {t_series * 1e3:8.2f}ms ({t_frame / t_series:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Reusable pipeline behind the Dune sales EDA notebook.
+
+Submodules and the names below are imported on first use, so
+``import dune_sales`` (and the ``dune-sales`` command's start-up) does not
+pay for pandas, and plotting libraries load only when a figure is drawn.
+The ``df.sales`` accessor is registered once :mod:`dune_sales.compact` has
+been imported (e.g. by accessing :func:`compact`).
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+#: Public name -> submodule that defines it.
+_EXPORTS = {
+    "BitmapIndex": "bitmap",
+    "Cube": "aggregates",
+    "DEFAULT_PATH": "load",
+    "compact": "compact",
+    "enrich": "features",
+    "iter_chunks": "load",
+    "load_enriched": "cache",
+    "load_sales": "load",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
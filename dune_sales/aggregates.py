@@ -0,0 +1,298 @@
+"""Single-pass aggregation cube behind the profit breakdowns.
+
+The notebook answered every breakdown with its own ``groupby`` over the
+full frame.  :class:`Cube` instead makes one pass over the integer codes of
+all breakdown dimensions, combines them into a mixed-radix cell key and
+accumulates sums, counts, minima and maxima per *observed* cell.  Any
+``groupby(dims)`` total or ``pivot_table`` over those dimensions is then a
+roll-up of the (much smaller) cell table.
+
+Derived dimensions are rolled up from stored ones: ``quarter`` and
+``month_name`` from ``month``.  ``Product_Category`` is a function of
+``Sub_Category`` and is stored alongside it, so rolling up from
+sub-category to category is a plain marginalization.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .dates import MONTH_NAMES
+from .features import PROFIT_LABELS, column
+
+DIMENSIONS = (
+    "Customer",
+    "Sales Person",
+    "Customer_Gender",
+    "age_group",
+    "State",
+    "Product_Category",
+    "Sub_Category",
+    "Payment Option",
+    "year",
+    "month",
+    "profit_label",
+)
+
+MEASURES = ("cost", "revenue", "profit")
+
+#: Dimensions computed from a stored one: name -> (source, mapping over source labels).
+DERIVED: dict[str, tuple[str, Callable[[pd.Index], pd.Index]]] = {
+    "quarter": ("month", lambda months: (months - 1) // 3 + 1),
+    "month_name": ("month", lambda months: pd.Index(MONTH_NAMES[months - 1])),
+}
+
+#: Cell keys below this radix product are accumulated with a dense bincount.
+DENSE_LIMIT = 1 << 22
+
+
+def encode(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Return ``(codes, labels)`` for *values*; missing values get code ``-1``."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(np.int64), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), pd.Index(labels)
+
+
+def _group(codes: np.ndarray, sizes: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Group rows of a ``(n, k)`` code matrix.
+
+    Returns the distinct code rows and, for every input row, the index of
+    its group.
+    """
+    strides = np.ones(len(sizes), dtype=np.int64)
+    for i in range(len(sizes) - 2, -1, -1):
+        strides[i] = strides[i + 1] * sizes[i + 1]
+    key = codes @ strides if len(sizes) else np.zeros(len(codes), np.int64)
+    total = int(np.prod(sizes, dtype=np.int64)) if len(sizes) else 1
+    if total <= DENSE_LIMIT:
+        present = np.bincount(key, minlength=total) > 0
+        uniq = np.flatnonzero(present)
+        lookup = np.cumsum(present) - 1
+        inverse = lookup[key]
+    else:
+        uniq, inverse = np.unique(key, return_inverse=True)
+    cells = np.empty((len(uniq), len(sizes)), dtype=np.int64)
+    rem = uniq
+    for i, stride in enumerate(strides):
+        cells[:, i], rem = np.divmod(rem, stride)
+    return cells, inverse
+
+
+def _combine(inverse: np.ndarray, ngroups: int, sums: np.ndarray, counts: np.ndarray | None,
+             mins: np.ndarray, maxs: np.ndarray):
+    """Fold per-row (or per-cell) statistics into *ngroups* groups."""
+    out_sums = np.zeros((ngroups, sums.shape[1]))
+    for j in range(sums.shape[1]):
+        out_sums[:, j] = np.bincount(inverse, weights=sums[:, j], minlength=ngroups)
+    out_counts = np.bincount(inverse, weights=counts, minlength=ngroups).astype(np.int64)
+    if mins.shape[1]:
+        out_mins = pd.DataFrame(mins).groupby(inverse).min().to_numpy()
+        out_maxs = pd.DataFrame(maxs).groupby(inverse).max().to_numpy()
+    else:
+        out_mins = out_maxs = np.empty((ngroups, 0))
+    return out_sums, out_counts, out_mins, out_maxs
+
+
+def _union(left: pd.Index, right: pd.Index) -> pd.Index:
+    """Union of two level tables, keeping *left*'s order (sorted if it was sorted)."""
+    union = left.append(right[~right.isin(left)])
+    return union.sort_values() if left.is_monotonic_increasing else union
+
+
+class Cube:
+    """Sums, counts, minima and maxima of :data:`MEASURES` over every observed cell.
+
+    Cubes built from different chunks, files or partitions are combined with
+    :meth:`merge`, which makes them usable as running aggregates.
+    """
+
+    def __init__(self, levels: dict[str, pd.Index], cells: np.ndarray, sums: np.ndarray,
+                 counts: np.ndarray, mins: np.ndarray, maxs: np.ndarray,
+                 measures: Sequence[str] = MEASURES):
+        self.levels = levels
+        self.cells = cells
+        self.sums = sums
+        self.counts = counts
+        self.mins = mins
+        self.maxs = maxs
+        self.measures = tuple(measures)
+
+    @property
+    def dims(self) -> tuple[str, ...]:
+        return tuple(self.levels)
+
+    @property
+    def rows(self) -> int:
+        """Number of transactions folded into the cube."""
+        return int(self.counts.sum())
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __repr__(self) -> str:
+        return f"<Cube {len(self)} cells over {', '.join(self.dims)}>"
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dims: Sequence[str] = DIMENSIONS,
+                   measures: Sequence[str] = MEASURES) -> "Cube":
+        """Build the cube from an enriched frame in one pass.
+
+        Rows with a missing value in any dimension are skipped, as
+        ``groupby`` would skip them.
+        """
+        levels, columns = {}, []
+        for dim in dims:
+            codes, labels = encode(column(df, dim))
+            levels[dim] = labels
+            columns.append(codes)
+        codes = np.column_stack(columns) if columns else np.empty((len(df), 0), np.int64)
+        valid = (codes >= 0).all(axis=1)
+        values = df[list(measures)].to_numpy(np.float64)
+        if not valid.all():
+            codes, values = codes[valid], values[valid]
+        cells, inverse = _group(codes, [len(levels[d]) for d in dims])
+        stats = _combine(inverse, len(cells), values, None, values, values)
+        return cls(levels, cells, *stats, measures=measures)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], dims: Sequence[str] = DIMENSIONS,
+                    measures: Sequence[str] = MEASURES) -> "Cube":
+        """Fold enriched chunks into one cube, holding one chunk at a time."""
+        cube = None
+        for chunk in chunks:
+            part = cls.from_frame(chunk, dims, measures)
+            cube = part if cube is None else cube.merge(part)
+        if cube is None:
+            raise ValueError("no chunks to aggregate")
+        return cube
+
+    def merge(self, other: "Cube") -> "Cube":
+        """Return the cube of both inputs' transactions.
+
+        Level tables are unioned by label, so cubes whose categoricals were
+        coded differently (e.g. from separate files) combine correctly.
+        """
+        if self.dims != other.dims or self.measures != other.measures:
+            raise ValueError("cubes must share dimensions and measures to be merged")
+        levels = {d: _union(self.levels[d], other.levels[d]) for d in self.dims}
+        recoded = [
+            np.column_stack([levels[d].get_indexer(cube.levels[d])[cube.cells[:, i]]
+                             for i, d in enumerate(self.dims)])
+            if self.dims else cube.cells
+            for cube in (self, other)
+        ]
+        cells, inverse = _group(np.concatenate(recoded), [len(levels[d]) for d in self.dims])
+        stats = _combine(inverse, len(cells),
+                         np.concatenate([self.sums, other.sums]),
+                         np.concatenate([self.counts, other.counts]),
+                         np.concatenate([self.mins, other.mins]),
+                         np.concatenate([self.maxs, other.maxs]))
+        return Cube(levels, cells, *stats, measures=self.measures)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the cube to an ``.npz`` file (no pickling)."""
+        meta = {
+            "measures": list(self.measures),
+            "levels": {d: labels.tolist() for d, labels in self.levels.items()},
+        }
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(fh, meta=np.array(json.dumps(meta)), cells=self.cells, sums=self.sums,
+                     counts=self.counts, mins=self.mins, maxs=self.maxs)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "Cube":
+        """Read a cube written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            levels = {d: pd.Index(labels) for d, labels in meta["levels"].items()}
+            return cls(levels, data["cells"], data["sums"], data["counts"],
+                       data["mins"], data["maxs"], meta["measures"])
+
+    def _dim_codes(self, dim: str) -> tuple[np.ndarray, pd.Index]:
+        if dim in self.levels:
+            return self.cells[:, self.dims.index(dim)], self.levels[dim]
+        if dim in DERIVED:
+            source, fn = DERIVED[dim]
+            src_codes, src_labels = self._dim_codes(source)
+            mapped = fn(src_labels)
+            labels = mapped.unique().sort_values()
+            return labels.get_indexer(mapped)[src_codes], labels
+        raise KeyError(f"{dim!r} is not a dimension of this cube")
+
+    def rollup(self, *dims: str, measures: Sequence[str] | None = None,
+               count: bool = True, extrema: bool = False) -> pd.DataFrame:
+        """Aggregate to *dims*, like ``df.groupby(list(dims))[measures].sum()``.
+
+        The result is indexed by the observed label combinations and, when
+        *count* is true, carries a ``count`` column of transactions.  With
+        *extrema*, ``<measure>_min`` and ``<measure>_max`` columns are added.
+        """
+        measures = self.measures if measures is None else tuple(measures)
+        cols = [self.measures.index(m) for m in measures]
+        pairs = [self._dim_codes(d) for d in dims]
+        codes = (np.column_stack([c for c, _ in pairs]) if pairs
+                 else np.empty((len(self), 0), np.int64))
+        groups, inverse = _group(codes, [len(labels) for _, labels in pairs])
+        sums, counts, mins, maxs = _combine(
+            inverse, len(groups), self.sums[:, cols], self.counts,
+            self.mins[:, cols] if extrema else np.empty((len(self), 0)),
+            self.maxs[:, cols] if extrema else np.empty((len(self), 0)))
+        data = {m: sums[:, j] for j, m in enumerate(measures)}
+        if count:
+            data["count"] = counts
+        if extrema:
+            for j, m in enumerate(measures):
+                data[f"{m}_min"] = mins[:, j]
+                data[f"{m}_max"] = maxs[:, j]
+        if not dims:
+            return pd.DataFrame(data)
+        arrays = [labels.take(groups[:, i]) for i, (_, labels) in enumerate(pairs)]
+        index = (pd.Index(arrays[0], name=dims[0]) if len(dims) == 1
+                 else pd.MultiIndex.from_arrays(arrays, names=list(dims)))
+        return pd.DataFrame(data, index=index)
+
+    def total(self, dim: str, measure: str = "profit") -> pd.Series:
+        """``df.groupby(dim)[measure].sum()`` answered from the cube."""
+        return self.rollup(dim, measures=[measure], count=False)[measure]
+
+    def mean(self, *dims: str, measure: str = "profit") -> pd.Series:
+        """``df.groupby(list(dims))[measure].mean()``, the estimator seaborn bars and lines plot."""
+        table = self.rollup(*dims, measures=[measure])
+        return (table[measure] / table["count"]).rename(measure)
+
+    def value_counts(self, dim: str, ascending: bool = False) -> pd.Series:
+        """``df[dim].value_counts()`` answered from the cube."""
+        counts = self.rollup(dim, measures=[], count=True)["count"]
+        return counts.sort_values(ascending=ascending, kind="stable").rename("count")
+
+    def pivot(self, index: str, columns: str, measure: str = "profit") -> pd.DataFrame:
+        """``df.pivot_table(values=measure, index=index, columns=columns, aggfunc='sum')``."""
+        return self.rollup(index, columns, measures=[measure], count=False)[measure].unstack(columns)
+
+
+def profit_breakdowns(cube: Cube) -> dict[str, pd.DataFrame]:
+    """The bivariate ``groupby(dim)['profit'].sum().reset_index()`` tables from the EDA."""
+    dims = ("Customer", "Sales Person", "age_group", "Product_Category",
+            "Payment Option", "Sub_Category")
+    return {dim: cube.total(dim).reset_index() for dim in dims}
+
+
+def loss_share(counts: pd.Series) -> float:
+    """Share of loss-making transactions from ``profit_label`` counts (0 when empty)."""
+    total = counts.sum()
+    return float(counts.get(PROFIT_LABELS[0], 0) / total) if total else 0.0
+
+
+def category_metrics(cube: Cube) -> pd.DataFrame:
+    """Cost, revenue and profit per ``Product_Category`` in the EDA's long (melted) layout."""
+    wide = cube.rollup("Product_Category", count=False).reset_index()
+    return pd.melt(wide, id_vars="Product_Category", var_name="Metric", value_name="Total")
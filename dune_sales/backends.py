@@ -0,0 +1,342 @@
+"""One analysis API over interchangeable execution engines.
+
+The notebook's breakdowns — ``value_counts``, ``groupby(...).sum()``,
+``pivot_table``, the melted category metrics, ``corr`` and the loss share —
+are expressed against :class:`Backend`, which each engine implements with
+four primitives: load-and-enrich, :meth:`~Backend.value_counts`,
+:meth:`~Backend.totals` and :meth:`~Backend.corr`.  The data stays in the
+engine's native representation; only the small result tables come back
+as pandas objects, so every backend answers in the same shape.
+
+* ``pandas`` — the reference pipeline (:func:`~dune_sales.load.load_sales`
+  plus :func:`~dune_sales.features.enrich`);
+* ``polars`` — lazy multi-threaded scan, parse and derive (``pip install polars``);
+* ``arrow`` — PyArrow CSV reader and compute kernels (``pip install pyarrow``).
+
+The engine is picked at runtime by name, or from ``$DUNE_SALES_BACKEND``::
+
+    backend = get_backend("polars")
+    backend.load()
+    backend.profit_by("State")
+
+:func:`conformance` runs every analysis on each backend and compares the
+results with the pandas reference.
+"""
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import MEASURES, loss_share
+from .clean import KNOWN_FIXES
+from .dates import DATE_FORMAT
+from .features import AGE_EDGES, AGE_LABELS, PROFIT_LABELS, enrich
+from .load import CATEGORY_COLUMNS, load_sales, resolve_path
+from .stats import NUMERIC_COLUMNS
+
+#: Environment variable naming the default backend.
+BACKEND_ENV = "DUNE_SALES_BACKEND"
+
+
+class Backend(ABC):
+    """Engine-independent analyses on top of the engine's primitives."""
+
+    name = ""
+
+    def __init__(self):
+        self.data: Any = None
+
+    def load(self, path: str | os.PathLike | None = None) -> "Backend":
+        """Read, clean and enrich the export into the engine's native table."""
+        self.data = self._load(resolve_path(path))
+        return self
+
+    @abstractmethod
+    def _load(self, path) -> Any:
+        """Engine-native enriched table of the CSV at *path*."""
+
+    @property
+    def rows(self) -> int:
+        return len(self.data)
+
+    # -- primitives ------------------------------------------------------
+
+    @abstractmethod
+    def value_counts(self, dim: str) -> pd.Series:
+        """``df[dim].value_counts()``."""
+
+    @abstractmethod
+    def totals(self, *dims: str, measures: Sequence[str] = MEASURES) -> pd.DataFrame:
+        """``df.groupby(list(dims))[measures].sum()`` plus a ``count`` column, sorted by *dims*."""
+
+    @abstractmethod
+    def corr(self, columns: Sequence[str] = NUMERIC_COLUMNS) -> pd.DataFrame:
+        """Pearson correlation matrix, like ``df.corr(numeric_only=True)``."""
+
+    # -- analyses built on them ------------------------------------------
+
+    def profit_by(self, dim: str) -> pd.Series:
+        return self.totals(dim, measures=("profit",))["profit"]
+
+    def pivot(self, index: str, columns: str, values: str = "profit") -> pd.DataFrame:
+        """``df.pivot_table(values=values, index=index, columns=columns, aggfunc='sum')``."""
+        return self.totals(index, columns, measures=(values,))[values].unstack(columns)
+
+    def monthly_profit(self) -> pd.DataFrame:
+        return self.pivot("year", "month")
+
+    def category_metrics(self) -> pd.DataFrame:
+        """Cost, revenue and profit per ``Product_Category`` in melted layout."""
+        wide = self.totals("Product_Category").drop(columns="count").reset_index()
+        return pd.melt(wide, id_vars="Product_Category", var_name="Metric", value_name="Total")
+
+    def loss_share(self) -> float:
+        return loss_share(self.value_counts("profit_label"))
+
+
+class PandasBackend(Backend):
+    name = "pandas"
+
+    def _load(self, path):
+        return enrich(load_sales(path))
+
+    def value_counts(self, dim: str) -> pd.Series:
+        counts = self.data[dim].value_counts()
+        return counts[counts > 0].rename("count").rename_axis(dim)
+
+    def totals(self, *dims: str, measures: Sequence[str] = MEASURES) -> pd.DataFrame:
+        grouped = self.data.groupby(list(dims), observed=True)
+        out = grouped[list(measures)].sum().astype(np.float64)
+        out["count"] = grouped.size()
+        return out.sort_index()
+
+    def corr(self, columns: Sequence[str] = NUMERIC_COLUMNS) -> pd.DataFrame:
+        return self.data[list(columns)].astype(np.float64).corr()
+
+
+class PolarsBackend(Backend):
+    name = "polars"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import polars
+        except ImportError as exc:
+            raise ImportError("the polars backend needs polars: pip install polars") from exc
+        self.pl = polars
+
+    def _load(self, path):
+        pl = self.pl
+        col = pl.col
+        age = pl.lit(AGE_LABELS[-1])
+        for edge, label in reversed(list(zip(AGE_EDGES, AGE_LABELS))):
+            age = pl.when(col("Customer_Age") <= edge).then(pl.lit(label)).otherwise(age)
+        loss, profit = PROFIT_LABELS
+        return (
+            pl.scan_csv(path, schema_overrides={"Date": pl.Utf8})
+            .drop_nulls()
+            .with_columns([col(c).replace(m) for c, m in KNOWN_FIXES.items() if m])
+            .with_columns(col("Date").str.strptime(pl.Date, DATE_FORMAT))
+            .with_columns(
+                year=col("Date").dt.year(),
+                month=col("Date").dt.month(),
+                month_name=col("Date").dt.strftime("%B"),
+                quarter=col("Date").dt.quarter(),
+                cost=col("Quantity") * col("Unit_Cost").cast(pl.Float64),
+                revenue=col("Quantity") * col("Unit_Price").cast(pl.Float64),
+                age_group=age,
+            )
+            .with_columns(profit=col("revenue") - col("cost"))
+            .with_columns(profit_label=pl.when(col("profit") >= 0).then(pl.lit(profit))
+                          .otherwise(pl.lit(loss)))
+            .collect()
+        )
+
+    def value_counts(self, dim: str) -> pd.Series:
+        pl = self.pl
+        out = (self.data.group_by(dim).agg(pl.len().alias("count"))
+               .sort(["count", dim], descending=[True, False]).to_pandas())
+        return out.set_index(dim)["count"]
+
+    def totals(self, *dims: str, measures: Sequence[str] = MEASURES) -> pd.DataFrame:
+        pl = self.pl
+        out = (self.data.group_by(list(dims))
+               .agg([pl.col(m).sum().cast(pl.Float64) for m in measures] + [pl.len().alias("count")])
+               .sort(list(dims)).to_pandas())
+        return out.set_index(list(dims))
+
+    def corr(self, columns: Sequence[str] = NUMERIC_COLUMNS) -> pd.DataFrame:
+        pl = self.pl
+        matrix = self.data.select([pl.col(c).cast(pl.Float64) for c in columns]).corr()
+        return pd.DataFrame(matrix.to_numpy(), index=list(columns), columns=list(columns))
+
+
+class ArrowBackend(Backend):
+    name = "arrow"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.csv
+        except ImportError as exc:
+            raise ImportError("the arrow backend needs pyarrow: pip install pyarrow") from exc
+        self.pa = pyarrow
+
+    def _load(self, path):
+        pa = self.pa
+        pc = pa.compute
+        options = pa.csv.ConvertOptions(column_types={"Date": pa.string(),
+                                                      **{c: pa.string() for c in CATEGORY_COLUMNS}})
+        table = pa.csv.read_csv(path, convert_options=options).drop_null()
+        for column, mapping in KNOWN_FIXES.items():
+            values = table[column]
+            for bad, good in mapping.items():
+                values = pc.if_else(pc.equal(values, bad), good, values)
+            table = table.set_column(table.schema.get_field_index(column), column, values)
+
+        date = pc.strptime(table["Date"], format=DATE_FORMAT, unit="s")
+        quantity = pc.cast(table["Quantity"], pa.float64())
+        cost = pc.multiply(quantity, pc.cast(table["Unit_Cost"], pa.float64()))
+        revenue = pc.multiply(quantity, pc.cast(table["Unit_Price"], pa.float64()))
+        profit = pc.subtract(revenue, cost)
+        age = pa.scalar(AGE_LABELS[-1])
+        for edge, label in reversed(list(zip(AGE_EDGES, AGE_LABELS))):
+            age = pc.if_else(pc.less_equal(table["Customer_Age"], edge), label, age)
+        loss, gain = PROFIT_LABELS
+        derived = {
+            "Date": date,
+            "year": pc.year(date),
+            "month": pc.month(date),
+            "month_name": pc.strftime(date, format="%B"),
+            "quarter": pc.quarter(date),
+            "cost": cost,
+            "revenue": revenue,
+            "profit": profit,
+            "age_group": age,
+            "profit_label": pc.if_else(pc.greater_equal(profit, 0), gain, loss),
+        }
+        for name, values in derived.items():
+            index = table.schema.get_field_index(name)
+            table = (table.set_column(index, name, values) if index >= 0
+                     else table.append_column(name, values))
+        return table
+
+    @property
+    def rows(self) -> int:
+        return self.data.num_rows
+
+    def value_counts(self, dim: str) -> pd.Series:
+        counts = self.pa.compute.value_counts(self.data[dim]).flatten()
+        out = pd.Series(counts[1].to_numpy(), index=pd.Index(counts[0].to_pylist(), name=dim),
+                        name="count")
+        return out.sort_values(ascending=False, kind="stable")
+
+    def totals(self, *dims: str, measures: Sequence[str] = MEASURES) -> pd.DataFrame:
+        aggs = [(m, "sum") for m in measures] + [(dims[0], "count")]
+        out = self.data.group_by(list(dims)).aggregate(aggs).to_pandas()
+        out = out.rename(columns={f"{m}_sum": m for m in measures} | {f"{dims[0]}_count": "count"})
+        return out.set_index(list(dims))[[*measures, "count"]].sort_index()
+
+    def corr(self, columns: Sequence[str] = NUMERIC_COLUMNS) -> pd.DataFrame:
+        matrix = np.column_stack([self.data[c].to_numpy().astype(np.float64) for c in columns])
+        return pd.DataFrame(np.corrcoef(matrix, rowvar=False), index=list(columns),
+                            columns=list(columns))
+
+
+BACKENDS: dict[str, type[Backend]] = {
+    "pandas": PandasBackend,
+    "polars": PolarsBackend,
+    "arrow": ArrowBackend,
+}
+
+
+def get_backend(name: str | None = None) -> Backend:
+    """Instantiate backend *name*, else ``$DUNE_SALES_BACKEND``, else pandas."""
+    name = name or os.environ.get(BACKEND_ENV, "pandas")
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"unknown backend {name!r}; choose from {sorted(BACKENDS)}") from None
+
+
+def available_backends() -> list[str]:
+    """Names of the backends whose engine is installed."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+#: Analyses compared by :func:`conformance`: name -> call on a loaded backend.
+ANALYSES: dict[str, Callable[[Backend], Any]] = {
+    **{f"value_counts {dim}": (lambda b, d=dim: b.value_counts(d))
+       for dim in (*CATEGORY_COLUMNS, "age_group", "month_name", "profit_label")},
+    **{f"profit_by {dim}": (lambda b, d=dim: b.profit_by(d))
+       for dim in ("Customer", "Sales Person", "age_group", "Product_Category",
+                   "Payment Option", "Sub_Category")},
+    "monthly_profit": lambda b: b.monthly_profit(),
+    "gender_age_profit": lambda b: b.pivot("age_group", "Customer_Gender"),
+    "category_metrics": lambda b: b.category_metrics(),
+    "corr": lambda b: b.corr(),
+    "loss_share": lambda b: b.loss_share(),
+}
+
+
+def _normalize(result: Any) -> Any:
+    """Engine-neutral form of a result: plain columns, numeric dtypes widened, rows sorted."""
+    if not isinstance(result, (pd.Series, pd.DataFrame)):
+        return float(result)
+    frame = result.to_frame() if isinstance(result, pd.Series) else result
+    frame = frame.copy()
+    frame.columns = [str(c) for c in frame.columns]
+    frame = frame.reset_index()
+    for col in frame.columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype == object:
+            frame[col] = values.astype(str)
+        elif pd.api.types.is_integer_dtype(values):
+            frame[col] = values.astype(np.int64)
+        elif pd.api.types.is_float_dtype(values):
+            frame[col] = values.astype(np.float64)
+    keys = [c for c in frame.columns if not pd.api.types.is_float_dtype(frame[c])]
+    return frame.sort_values(keys, kind="stable").reset_index(drop=True) if keys else frame
+
+
+def conformance(path: str | os.PathLike | None = None, backends: Sequence[str] | None = None,
+                rtol: float = 1e-4) -> pd.DataFrame:
+    """Run :data:`ANALYSES` on each backend and compare with pandas.
+
+    Returns one row per (analysis, backend) with ``ok`` and the mismatch
+    message, if any.  Backends that are not installed are skipped.  The
+    pandas pipeline keeps money in ``float32``, hence the loose *rtol*.
+    """
+    names = [n for n in (backends or available_backends()) if n != "pandas"]
+    reference = get_backend("pandas").load(path)
+    expected = {name: _normalize(fn(reference)) for name, fn in ANALYSES.items()}
+    rows = []
+    for backend_name in names:
+        backend = get_backend(backend_name).load(path)
+        for name, fn in ANALYSES.items():
+            error = ""
+            try:
+                got = _normalize(fn(backend))
+                if isinstance(got, float):
+                    np.testing.assert_allclose(got, expected[name], rtol=rtol)
+                else:
+                    pd.testing.assert_frame_equal(got, expected[name], check_dtype=False,
+                                                  check_exact=False, rtol=rtol)
+            except Exception as exc:  # a mismatch or an engine error both fail the check
+                error = f"{type(exc).__name__}: {exc}".splitlines()[0]
+            rows.append({"analysis": name, "backend": backend_name, "ok": not error,
+                         "error": error})
+    return pd.DataFrame(rows, columns=["analysis", "backend", "ok", "error"])
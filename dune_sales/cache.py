@@ -0,0 +1,143 @@
+"""Columnar on-disk cache of the cleaned and enriched sales frame.
+
+The enriched frame is written once as an uncompressed Feather (Arrow IPC)
+file.  The file name embeds a key built from the SHA-256 of the source CSV
+and :data:`~dune_sales.features.PIPELINE_VERSION`, so editing either the
+export or a derivation produces a miss and the stale file is removed.
+The name is prefixed with the source's stem and a hash of its resolved
+path, so same-named exports in different directories keep separate entries.
+Warm starts memory-map the Feather file instead of re-parsing the CSV.
+
+Hashing a multi-GB export is itself costly, so the digest is remembered in
+``index.json`` next to the cache and reused while the file's size and
+modification time are unchanged.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .features import PIPELINE_VERSION, enrich
+from .load import DEFAULT_CHUNKSIZE, load_sales, resolve_path
+
+#: Environment variable that overrides the cache directory.
+CACHE_ENV = "DUNE_SALES_CACHE"
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "dune_sales"
+
+_HASH_BLOCK = 1 << 20
+
+
+def resolve_cache_dir(cache_dir: str | os.PathLike | None = None) -> Path:
+    """Return *cache_dir*, else ``$DUNE_SALES_CACHE``, else ``~/.cache/dune_sales``."""
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_ENV, DEFAULT_CACHE_DIR)
+    return Path(cache_dir)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.feather as feather
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError("the frame cache needs pyarrow; install it with "
+                          "`pip install pyarrow`") from exc
+    return feather
+
+
+def file_digest(path: str | os.PathLike, cache_dir: str | os.PathLike | None = None) -> str:
+    """Return the SHA-256 of *path*, reusing the recorded digest if the file is unchanged."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    index_path = resolve_cache_dir(cache_dir) / "index.json"
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        index = {}
+    entry = index.get(str(path))
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            h.update(block)
+    index[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                        "sha256": h.hexdigest()}
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write_text(index_path, json.dumps(index, indent=1))
+    return h.hexdigest()
+
+
+def cache_key(path: str | os.PathLike | None = None,
+              cache_dir: str | os.PathLike | None = None) -> str:
+    """Key identifying the enriched frame for the current CSV and pipeline version."""
+    digest = file_digest(resolve_path(path), cache_dir)
+    return hashlib.sha256(f"{digest}:{PIPELINE_VERSION}".encode()).hexdigest()[:16]
+
+
+def cache_path(path: str | os.PathLike | None = None,
+               cache_dir: str | os.PathLike | None = None) -> Path:
+    """Location of the Feather file for the current key.
+
+    The name is ``<stem>-<path hash>-<key>.feather``; everything before the
+    last ``-`` identifies the source file, see :func:`write_cache`.
+    """
+    source = resolve_path(path).resolve()
+    stem = source.stem.replace(" ", "_")
+    tag = hashlib.sha256(str(source).encode()).hexdigest()[:8]
+    return resolve_cache_dir(cache_dir) / f"{stem}-{tag}-{cache_key(path, cache_dir)}.feather"
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def write_cache(df: pd.DataFrame, target: Path) -> None:
+    """Write *df* to *target* atomically and drop older entries for the same source file."""
+    feather = _require_pyarrow()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".feather.tmp")
+    # Uncompressed so readers can memory-map the buffers directly.
+    feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+    os.replace(tmp, target)
+    prefix = target.name.rsplit("-", 1)[0]
+    for stale in target.parent.glob(f"{glob.escape(prefix)}-*.feather"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+
+
+def read_cache(target: Path) -> pd.DataFrame:
+    """Memory-map a cached Feather file back into a frame."""
+    feather = _require_pyarrow()
+    table = feather.read_table(target, memory_map=True)
+    return table.to_pandas()
+
+
+def load_enriched(path: str | os.PathLike | None = None,
+                  cache_dir: str | os.PathLike | None = None,
+                  refresh: bool = False,
+                  chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """Return the cleaned and enriched frame, building the cache on a miss.
+
+    Parameters
+    ----------
+    path:
+        Source CSV; see :func:`dune_sales.load.resolve_path`.
+    cache_dir:
+        Cache directory; see :func:`resolve_cache_dir`.
+    refresh:
+        Rebuild the cache even if a valid entry exists.
+    """
+    target = cache_path(path, cache_dir)
+    if target.exists() and not refresh:
+        return read_cache(target)
+    df = enrich(load_sales(path, chunksize))
+    write_cache(df, target)
+    return df
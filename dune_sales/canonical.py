@@ -0,0 +1,114 @@
+"""Canonicalization of categorical values through per-column mapping tables.
+
+The notebook fixed the ``'Hign'`` typo with a whole-column string
+comparison.  Here every categorical column is first reduced to its value
+counts (one pass, reading only those columns), a mapping is built once per
+*distinct* value, and the mapping is applied to the category table of each
+chunk (see :func:`dune_sales.clean.remap_categories`).  Building and
+applying the mapping cost time in the number of distinct values, not rows.
+
+A value is mapped when
+
+* it differs from a more frequent value only in case or surrounding
+  whitespace,
+* its column has a known domain (:data:`dune_sales.quality.DOMAINS`) and it
+  is outside it but close to a member (``'Hign'`` → ``'High'``), or
+* it is rare (below *rare_share* of the column) and close to a frequent
+  value.
+"""
+from __future__ import annotations
+
+import difflib
+import os
+from typing import Iterable, Mapping
+
+import pandas as pd
+
+from .clean import KNOWN_FIXES
+from .load import CATEGORY_COLUMNS, DEFAULT_CHUNKSIZE, iter_raw_chunks
+from .quality import DOMAINS
+
+#: Similarity (``difflib`` ratio) needed to map an out-of-domain value to a domain member.
+DOMAIN_CUTOFF = 0.6
+
+#: Similarity needed to map a rare value to a frequent one.
+RARE_CUTOFF = 0.85
+
+#: Values below this share of their column count as rare.
+RARE_SHARE = 0.01
+
+
+def _normal(value: str) -> str:
+    return " ".join(str(value).split()).casefold()
+
+
+def column_mapping(counts: pd.Series, domain: Iterable[str] | None = None,
+                   rare_share: float = RARE_SHARE) -> pd.DataFrame:
+    """Build the mapping table for one column from its value counts.
+
+    Returns one row per remapped value with ``value``, ``canonical``,
+    ``count`` and ``reason``.
+    """
+    counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+    total = counts.sum()
+    domain = set(domain) if domain is not None else None
+    frequent = [v for v, n in counts.items() if n >= rare_share * total]
+    by_normal: dict[str, str] = {}
+    for value in counts.index:  # most frequent spelling wins
+        by_normal.setdefault(_normal(value), value)
+
+    rows = []
+    for value, n in counts.items():
+        target, reason = by_normal[_normal(value)], "case/whitespace"
+        if domain is not None and target not in domain:
+            match = difflib.get_close_matches(target, sorted(domain), n=1, cutoff=DOMAIN_CUTOFF)
+            target, reason = (match[0], "outside domain") if match else (target, "")
+        elif domain is None and target == value and n < rare_share * total:
+            others = [f for f in frequent if f != value]
+            match = difflib.get_close_matches(value, others, n=1, cutoff=RARE_CUTOFF)
+            target, reason = (match[0], "rare variant") if match else (target, "")
+        if target != value:
+            rows.append((value, target, int(n), reason))
+    return pd.DataFrame(rows, columns=["value", "canonical", "count", "reason"])
+
+
+class Canonicalizer:
+    """Per-column mapping tables learnt from value counts."""
+
+    def __init__(self, tables: Mapping[str, pd.DataFrame] | None = None):
+        self.tables = dict(tables or {})
+
+    @classmethod
+    def fit(cls, counts: Mapping[str, pd.Series], rare_share: float = RARE_SHARE) -> "Canonicalizer":
+        """Build mappings from ``{column: value_counts}``."""
+        return cls({col: column_mapping(c, DOMAINS.get(col), rare_share)
+                    for col, c in counts.items()})
+
+    @classmethod
+    def fit_file(cls, path: str | os.PathLike | None = None,
+                 columns: Iterable[str] = CATEGORY_COLUMNS,
+                 chunksize: int = DEFAULT_CHUNKSIZE,
+                 rare_share: float = RARE_SHARE) -> "Canonicalizer":
+        """Count the values of *columns* in one pass over the export and fit."""
+        columns = list(columns)
+        counts: dict[str, pd.Series] = {}
+        for chunk in iter_raw_chunks(path, chunksize, usecols=columns):
+            for col in columns:
+                vc = chunk[col].value_counts()
+                counts[col] = vc if col not in counts else counts[col].add(vc, fill_value=0)
+        return cls.fit(counts, rare_share)
+
+    @property
+    def fixes(self) -> dict[str, dict[str, str]]:
+        """``{column: {value: canonical}}``, merged with :data:`~dune_sales.clean.KNOWN_FIXES`."""
+        out = {col: dict(mapping) for col, mapping in KNOWN_FIXES.items()}
+        for col, table in self.tables.items():
+            out.setdefault(col, {}).update(zip(table["value"], table["canonical"]))
+        return out
+
+    def table(self) -> pd.DataFrame:
+        """All mapping tables stacked, with a ``column`` column."""
+        frames = [t.assign(column=col) for col, t in self.tables.items() if len(t)]
+        if not frames:
+            return pd.DataFrame(columns=["column", "value", "canonical", "count", "reason"])
+        return pd.concat(frames, ignore_index=True)[["column", "value", "canonical", "count", "reason"]]
@@ -0,0 +1,82 @@
+"""Row-level cleaning applied to every chunk as it is read."""
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+#: Nullable integer columns and the numpy dtype they narrow to after ``dropna``
+#: (see :func:`narrow_ints`).
+INT_COLUMNS = {
+    "Quantity": "int16",
+    "Customer_Age": "int8",
+}
+
+#: Known misspellings in the ``Customer`` column (see the countplot in the EDA).
+CUSTOMER_FIXES = {"Hign": "High"}
+
+#: Value fixes applied to every chunk, per column.
+KNOWN_FIXES = {"Customer": CUSTOMER_FIXES}
+
+
+def remap_categories(col: pd.Series, mapping: Mapping[str, str]) -> pd.Series:
+    """Rename categories of *col* through *mapping*, merging any that collide.
+
+    The work is done on the category table and a single gather over the
+    codes, so the cost does not depend on string comparisons per row.
+    """
+    cats = col.cat.categories
+    target = pd.Index([mapping.get(c, c) for c in cats])
+    new_cats = target.unique()
+    lookup = new_cats.get_indexer(target)
+    codes = col.cat.codes.to_numpy()
+    new_codes = np.where(codes < 0, -1, lookup[codes])
+    return pd.Series(pd.Categorical.from_codes(new_codes, new_cats),
+                     index=col.index, name=col.name)
+
+
+def apply_fixes(df: pd.DataFrame, fixes: Mapping[str, Mapping[str, str]]) -> pd.DataFrame:
+    """Rewrite values through a ``{column: {value: canonical}}`` table, in place."""
+    for col, mapping in fixes.items():
+        if col not in df or not mapping:
+            continue
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = remap_categories(values, mapping)
+        else:
+            df[col] = values.replace(mapping)
+    return df
+
+
+def narrow_ints(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast the :data:`INT_COLUMNS` of *df* to their narrow dtypes.
+
+    Raises :class:`ValueError` if a value does not fit, instead of letting
+    the cast wrap it (an age of 150 would otherwise become -106).
+    """
+    targets = {col: dtype for col, dtype in INT_COLUMNS.items() if col in df}
+    for col, dtype in targets.items():
+        values = df[col]
+        if values.empty:
+            continue
+        bounds = np.iinfo(dtype)
+        low, high = values.min(), values.max()
+        if low < bounds.min or high > bounds.max:
+            bad = low if low < bounds.min else high
+            raise ValueError(f"{col} value {bad} does not fit {dtype} "
+                             f"[{bounds.min}, {bounds.max}]")
+    return df.astype(targets)
+
+
+def clean_chunk(df: pd.DataFrame,
+                fixes: Mapping[str, Mapping[str, str]] | None = None) -> pd.DataFrame:
+    """Drop incomplete rows, narrow integer columns and fix known typos.
+
+    Integer values that do not fit their narrow dtype raise :class:`ValueError`.
+
+    *fixes* defaults to :data:`KNOWN_FIXES`; pass a table from
+    :mod:`dune_sales.canonical` to canonicalize more columns.
+    """
+    df = narrow_ints(df.dropna())
+    return apply_fixes(df, KNOWN_FIXES if fixes is None else fixes)
@@ -0,0 +1,178 @@
+"""``dune-sales`` command line: run only the analyses you ask for.
+
+Each subcommand imports what it needs when it runs, so ``--help`` and the
+aggregate-only commands never load matplotlib or seaborn::
+
+    dune-sales counts State
+    dune-sales profit "Sales Person" --format csv
+    dune-sales pivot year month
+    dune-sales corr
+    dune-sales loss-share
+    dune-sales report --out report/
+
+``python -m dune_sales ...`` is equivalent.  The source defaults to
+``$DUNE_SALES_CSV`` or the bundled export; ``--source`` also accepts a
+directory or glob of partitions for the cube-based commands.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Callable
+
+FORMATS = ("table", "csv", "json")
+
+
+def _cube(args: argparse.Namespace):
+    from .load import resolve_path
+    from .partition import aggregate_partitions
+
+    source = args.source if args.source is not None else resolve_path()
+    return aggregate_partitions(source, workers=args.workers)
+
+
+def _emit(result: Any, fmt: str) -> None:
+    import pandas as pd
+
+    if not isinstance(result, (pd.Series, pd.DataFrame)):
+        print(json.dumps(result) if fmt == "json" else result)
+    elif fmt == "csv":
+        print(result.to_csv(), end="")
+    elif fmt == "json":
+        print(result.to_json(orient="split" if isinstance(result, pd.DataFrame) else "index"))
+    else:
+        print(result.to_string())
+
+
+def _counts(args):
+    return _cube(args).value_counts(args.dim)
+
+
+def _profit(args):
+    return _cube(args).total(args.dim, args.measure)
+
+
+def _pivot(args):
+    return _cube(args).pivot(args.index, args.columns, args.values)
+
+
+def _metrics(args):
+    from .aggregates import category_metrics
+
+    return category_metrics(_cube(args))
+
+
+def _loss_share(args):
+    from .aggregates import loss_share
+
+    return round(loss_share(_cube(args).value_counts("profit_label")), 6)
+
+
+def _corr(args):
+    from .stats import summarize_file
+
+    numeric, _ = summarize_file(args.source)
+    return numeric.corr()
+
+
+def _describe(args):
+    from .stats import summarize_file
+
+    numeric, categorical = summarize_file(args.source)
+    return numeric.describe() if args.kind == "numeric" else categorical.describe()
+
+
+def _quality(args):
+    from .quality import scan
+
+    return scan(args.source).summary()
+
+
+def _drilldown(args):
+    from .drilldown import loss_segments
+    from .features import enrich
+    from .load import load_sales
+
+    segments = loss_segments(enrich(load_sales(args.source)), min_support=args.min_support)
+    return segments.head(args.top)
+
+
+def _delegate(module: str) -> Callable[[argparse.Namespace], None]:
+    """Hand the remaining arguments to another module's own ``main``."""
+    def run(args: argparse.Namespace) -> None:
+        import importlib
+
+        argv = list(args.rest)
+        if args.source is not None:
+            argv = ["--source", args.source, *argv]
+        importlib.import_module(f".{module}", __package__).main(argv)
+    return run
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="dune-sales", description="Dune sales analyses.")
+    parser.add_argument("--source", help="CSV export (default: $DUNE_SALES_CSV or the bundled file)")
+    parser.add_argument("--format", choices=FORMATS, default="table")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for partitioned sources (default 1)")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    p = sub.add_parser("counts", help="transactions per label of a dimension")
+    p.add_argument("dim")
+    p.set_defaults(func=_counts)
+
+    p = sub.add_parser("profit", help="sum of a measure per label of a dimension")
+    p.add_argument("dim")
+    p.add_argument("--measure", default="profit", choices=("cost", "revenue", "profit"))
+    p.set_defaults(func=_profit)
+
+    p = sub.add_parser("pivot", help="measure summed over two dimensions")
+    p.add_argument("index")
+    p.add_argument("columns")
+    p.add_argument("--values", default="profit", choices=("cost", "revenue", "profit"))
+    p.set_defaults(func=_pivot)
+
+    sub.add_parser("metrics", help="cost, revenue and profit per product category") \
+        .set_defaults(func=_metrics)
+    sub.add_parser("loss-share", help="share of loss-making transactions") \
+        .set_defaults(func=_loss_share)
+    sub.add_parser("corr", help="correlation matrix of the numeric columns") \
+        .set_defaults(func=_corr)
+
+    p = sub.add_parser("describe", help="streaming describe() of the enriched data")
+    p.add_argument("kind", nargs="?", choices=("numeric", "categorical"), default="numeric")
+    p.set_defaults(func=_describe)
+
+    sub.add_parser("quality", help="data-quality findings of the raw export") \
+        .set_defaults(func=_quality)
+
+    p = sub.add_parser("drilldown", help="segments where losses concentrate")
+    p.add_argument("--min-support", type=float, default=0.001)
+    p.add_argument("--top", type=int, default=20)
+    p.set_defaults(func=_drilldown)
+
+    for name, module, help_text in (("report", "report", "render the figures and HTML report"),
+                                    ("serve", "service", "serve the breakdowns over HTTP"),
+                                    ("profile", "profiling", "time each pipeline stage"),
+                                    ("export", "export", "publish the tables as Arrow IPC files")):
+        p = sub.add_parser(name, help=help_text, add_help=False)
+        p.add_argument("rest", nargs=argparse.REMAINDER)
+        p.set_defaults(func=_delegate(module), delegated=True)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args, extra = build_parser().parse_known_args(argv)
+    if getattr(args, "delegated", False):
+        args.rest = [*extra, *args.rest]
+    elif extra:
+        build_parser().error(f"unrecognized arguments: {' '.join(extra)}")
+    result = args.func(args)
+    if result is not None:
+        _emit(result, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Compact in-memory representation of the enriched sales frame.
+
+:func:`compact` applies :data:`SCHEMA`: categoricals for every string
+column (including ``Date``, which has few distinct days), the narrowest
+integer type for counts and calendar parts, ``float32`` for money, and it
+drops the columns in :data:`~dune_sales.features.LAZY_COLUMNS`, which are
+recomputed on access through the ``df.sales`` accessor::
+
+    small, report = compact(df)
+    print(report)                       # bytes before/after, per column
+    small.sales.profit_label            # derived on demand
+    small.sales.materialize("month_name")
+"""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .features import LAZY_COLUMNS, column
+
+#: Target dtypes of the enriched frame's columns.
+SCHEMA = {
+    "Customer": "category",
+    "Sales Person": "category",
+    "Customer_Gender": "category",
+    "State": "category",
+    "Product_Category": "category",
+    "Sub_Category": "category",
+    "Payment Option": "category",
+    "age_group": "category",
+    "Customer_Age": "int8",
+    "Quantity": "int16",
+    "year": "int16",
+    "month": "int8",
+    "quarter": "int8",
+    "Unit_Cost": "float32",
+    "Unit_Price": "float32",
+    "cost": "float32",
+    "revenue": "float32",
+    "profit": "float32",
+}
+
+#: Object or datetime columns with fewer distinct values than this share of rows become categoricals.
+CATEGORY_RATIO = 0.5
+
+
+class MemoryReport(NamedTuple):
+    before: int
+    after: int
+    columns: pd.DataFrame
+
+    @property
+    def ratio(self) -> float:
+        return self.before / max(self.after, 1)
+
+    def __str__(self) -> str:
+        return (f"{self.before / 2**20:,.1f} MiB -> {self.after / 2**20:,.1f} MiB "
+                f"({self.ratio:.1f}x smaller)\n{self.columns.to_string()}")
+
+
+def _shrink(values: pd.Series) -> pd.Series:
+    target = SCHEMA.get(values.name)
+    if target is not None:
+        return values if values.dtype == target else values.astype(target)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    if values.dtype == object or pd.api.types.is_datetime64_any_dtype(values):
+        if values.nunique(dropna=False) < CATEGORY_RATIO * len(values):
+            return values.astype("category")
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast="integer")
+    if pd.api.types.is_float_dtype(values):
+        return pd.to_numeric(values, downcast="float")
+    return values
+
+
+def compact(df: pd.DataFrame, keep_lazy: bool = False) -> tuple[pd.DataFrame, MemoryReport]:
+    """Return a compact copy of *df* and a before/after ``memory_usage(deep=True)`` report.
+
+    Unless *keep_lazy*, the derivable columns in
+    :data:`~dune_sales.features.LAZY_COLUMNS` are dropped.
+    """
+    before = df.memory_usage(deep=True, index=True)
+    drop = [] if keep_lazy else [c for c in LAZY_COLUMNS if c in df]
+    out = pd.DataFrame({c: _shrink(df[c]) for c in df.columns if c not in drop}, index=df.index)
+    after = out.memory_usage(deep=True, index=True)
+    columns = pd.DataFrame({
+        "before": before,
+        "after": after.reindex(before.index, fill_value=0),
+        "dtype_before": df.dtypes.astype(str).reindex(before.index),
+        "dtype_after": out.dtypes.astype(str).reindex(before.index),
+    })
+    columns.loc[drop, "dtype_after"] = "lazy"
+    return out, MemoryReport(int(before.sum()), int(after.sum()), columns)
+
+
+@pd.api.extensions.register_dataframe_accessor("sales")
+class SalesAccessor:
+    """``df.sales.<name>`` returns a stored or lazily derived column."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+
+    def __getattr__(self, name: str) -> pd.Series:
+        try:
+            return column(self._df, name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return column(self._df, name)
+
+    def materialize(self, *names: str) -> pd.DataFrame:
+        """Return the frame with the named lazy columns stored (all of them by default)."""
+        names = names or tuple(LAZY_COLUMNS)
+        return self._df.assign(**{n: column(self._df, n) for n in names})
+
+    def memory(self) -> int:
+        """Bytes held by the frame, ``memory_usage(deep=True)``."""
+        return int(np.sum(self._df.memory_usage(deep=True)))
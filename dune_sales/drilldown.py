@@ -0,0 +1,135 @@
+"""Where do the loss-making transactions concentrate?
+
+The notebook stops at ``Counter(df['profit_label'])``: about 13.9% of
+transactions lose money.  :func:`loss_segments` ranks every combination
+of labels across ``Sales Person × Sub_Category × State × month`` (or any
+other dimensions) by how concentrated the losses are in it, without
+enumerating the cross-product.
+
+The search is apriori-style over the dimension codes.  A segment's row
+count and loss count can only shrink when another dimension is added, so
+a segment below ``min_support`` rows (or ``min_losses`` losses) cannot
+have any qualifying refinement.  Level *k + 1* therefore only counts rows
+whose every *k*-dimension projection is a surviving segment; the rows
+scanned shrink as the levels deepen.  Each level is one mixed-radix key
+and one ``np.unique`` per dimension combination::
+
+    segments = loss_segments(df, min_support=100)
+    segments.head(20)        # highest loss rate relative to the overall rate
+"""
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import encode
+
+DRILL_DIMENSIONS = ("Sales Person", "Sub_Category", "State", "month")
+
+#: Columns of the result that rank a segment.
+SORT_KEYS = ("lift", "loss_rate", "losses", "loss_amount", "count")
+
+
+def _keys(codes: dict[str, np.ndarray], dims: tuple[str, ...], sizes: dict[str, int],
+          rows: np.ndarray) -> np.ndarray:
+    key = np.zeros(len(rows), dtype=np.int64)
+    for dim in dims:
+        key = key * sizes[dim] + codes[dim][rows]
+    return key
+
+
+def _decode(keys: np.ndarray, dims: tuple[str, ...], sizes: dict[str, int]) -> dict[str, np.ndarray]:
+    out = {}
+    for dim in reversed(dims):
+        keys, out[dim] = np.divmod(keys, sizes[dim])
+    return out
+
+
+def loss_segments(df: pd.DataFrame, dims: Sequence[str] = DRILL_DIMENSIONS,
+                  min_support: int | float = 0.001, min_losses: int = 1,
+                  max_size: int | None = None, sort: str = "lift") -> pd.DataFrame:
+    """Rank label combinations over *dims* by concentration of loss-making rows.
+
+    Parameters
+    ----------
+    df:
+        Enriched frame with the *dims* columns and ``profit``.
+    min_support:
+        Minimum rows in a segment; a float below 1 is a share of all rows.
+    min_losses:
+        Minimum loss-making rows in a segment.
+    max_size:
+        Deepest combination searched (default: all of *dims*).
+    sort:
+        Column to rank by, one of :data:`SORT_KEYS`.
+
+    The result has one column per dimension (``None`` where the segment
+    does not constrain it), ``size``, ``count``, ``losses``, ``loss_rate``,
+    ``lift`` (loss rate over the overall loss rate), ``loss_amount`` (sum of
+    negative profit, as a positive number) and ``loss_share`` of the total
+    loss amount.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {SORT_KEYS}, got {sort!r}")
+    dims = tuple(dims)
+    profit = df['profit'].to_numpy(dtype=np.float64)
+    codes, labels = {}, {}
+    valid = ~np.isnan(profit)
+    for dim in dims:
+        codes[dim], labels[dim] = encode(df[dim])
+        valid &= codes[dim] >= 0
+    loss = profit < 0
+    amount = np.where(loss, -profit, 0.0)
+    total_rows = int(valid.sum())
+    total_losses = int(loss[valid].sum())
+    total_amount = float(amount[valid].sum())
+    support = int(np.ceil(min_support * total_rows)) if isinstance(min_support, float) \
+        and min_support < 1 else int(min_support)
+    sizes = {d: max(len(labels[d]), 1) for d in dims}
+    all_rows = np.flatnonzero(valid)
+
+    frequent: dict[tuple[str, ...], np.ndarray] = {(): np.zeros(1, dtype=np.int64)}
+    results = []
+    for k in range(1, (max_size or len(dims)) + 1):
+        level: dict[tuple[str, ...], np.ndarray] = {}
+        for combo in combinations(dims, k):
+            parents = list(combinations(combo, k - 1))
+            if any(p not in frequent or not len(frequent[p]) for p in parents):
+                continue
+            # Keep only rows whose every (k-1)-projection survived the previous level.
+            rows = all_rows
+            for parent in parents:
+                if parent:
+                    keys = _keys(codes, parent, sizes, rows)
+                    rows = rows[np.isin(keys, frequent[parent])]
+            if not len(rows):
+                continue
+            keys, inverse, counts = np.unique(_keys(codes, combo, sizes, rows),
+                                              return_inverse=True, return_counts=True)
+            losses = np.bincount(inverse, weights=loss[rows], minlength=len(keys))
+            amounts = np.bincount(inverse, weights=amount[rows], minlength=len(keys))
+            keep = (counts >= support) & (losses >= min_losses)
+            level[combo] = keys[keep]
+            if keep.any():
+                parts = _decode(keys[keep], combo, sizes)
+                segment = {d: labels[d].take(parts[d]) if d in combo else None for d in dims}
+                segment.update(size=k, count=counts[keep], losses=losses[keep].astype(np.int64),
+                               loss_amount=amounts[keep])
+                results.append(pd.DataFrame(segment))
+        if not any(len(v) for v in level.values()):
+            break
+        frequent = level
+
+    columns = [*dims, "size", "count", "losses", "loss_rate", "lift", "loss_amount", "loss_share"]
+    if not results:
+        return pd.DataFrame(columns=columns)
+    out = pd.concat(results, ignore_index=True)
+    out["loss_rate"] = out["losses"] / out["count"]
+    overall = total_losses / total_rows if total_rows else 0.0
+    out["lift"] = out["loss_rate"] / overall if overall else np.nan
+    out["loss_share"] = out["loss_amount"] / total_amount if total_amount else np.nan
+    out = out[columns].astype({d: object for d in dims})
+    return out.sort_values([sort, "count"], ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,176 @@
+"""Publish the enriched frame and every aggregate as Arrow IPC files.
+
+The breakdowns the EDA computes — counts per dimension, the profit
+tables, the melted category metrics (the notebook's ``procat``), the
+pivots and the correlation matrix ``a`` — otherwise live only inside one
+Python process.  :func:`publish` writes each of them, plus the enriched
+frame, as an uncompressed Arrow IPC file in a shared directory and
+records them in ``manifest.json``::
+
+    publish("/srv/dune")                        # from the default export
+    table = attach("/srv/dune", "monthly_profit")   # in another process
+
+Uncompressed IPC files can be memory-mapped, so :func:`attach` hands back
+a ``pyarrow.Table`` whose buffers point into the page cache: nothing is
+parsed or copied.  Every table's content fingerprint is kept in the
+manifest and only tables whose content changed are rewritten; when the
+source export and pipeline version are unchanged nothing is recomputed at
+all.  Files are replaced by rename and the manifest is written last, so a
+reader never sees a half-written table.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .aggregates import DIMENSIONS, Cube, category_metrics, profit_breakdowns
+from .cache import _atomic_write_text, cache_key, load_enriched
+from .features import PIPELINE_VERSION
+from .stats import NUMERIC_COLUMNS
+
+MANIFEST = "manifest.json"
+
+#: Bump when the layout of the published tables changes.
+EXPORT_VERSION = "1"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("the Arrow export needs pyarrow; install it with "
+                          "`pip install pyarrow`") from exc
+    return pa
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"\W+", "_", text).strip("_").lower()
+
+
+def _flat(table: pd.Series | pd.DataFrame) -> pd.DataFrame:
+    """Index levels as columns and string column names, as Arrow needs."""
+    frame = table.to_frame() if isinstance(table, pd.Series) else table
+    if frame.index.name is not None or isinstance(frame.index, pd.MultiIndex):
+        frame = frame.reset_index()
+    frame = frame.copy()
+    frame.columns = [str(c) for c in frame.columns]
+    return frame.reset_index(drop=True)
+
+
+def aggregate_tables(df: pd.DataFrame, cube: Cube | None = None) -> dict[str, pd.DataFrame]:
+    """Every aggregate the EDA uses, keyed by published table name."""
+    cube = cube if cube is not None else Cube.from_frame(df)
+    tables = {f"counts_{_slug(dim)}": cube.value_counts(dim) for dim in DIMENSIONS}
+    tables.update({f"profit_{_slug(dim)}": table for dim, table in profit_breakdowns(cube).items()})
+    tables["category_metrics"] = category_metrics(cube)
+    tables["monthly_profit"] = cube.pivot("year", "month")
+    tables["gender_age_profit"] = cube.pivot("age_group", "Customer_Gender")
+    tables["corr"] = df[list(NUMERIC_COLUMNS)].corr().rename_axis("column")
+    return {name: _flat(table) for name, table in tables.items()}
+
+
+def fingerprint(frame: pd.DataFrame) -> str:
+    """Content hash of a table, including its column names and dtypes."""
+    h = hashlib.sha256(EXPORT_VERSION.encode())
+    h.update(repr([(c, str(t)) for c, t in frame.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def read_manifest(directory: str | os.PathLike) -> dict[str, Any]:
+    try:
+        return json.loads((Path(directory) / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {"tables": {}}
+
+
+def _write_table(frame: pd.DataFrame, target: Path) -> None:
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    tmp = target.with_name(target.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, target)
+
+
+def publish(directory: str | os.PathLike, path: str | os.PathLike | None = None,
+            df: pd.DataFrame | None = None, force: bool = False) -> dict[str, Any]:
+    """Write the enriched frame and :func:`aggregate_tables` to *directory*.
+
+    Without *df* the enriched frame comes from :func:`~dune_sales.cache.load_enriched`
+    for *path*, and nothing is done if the manifest already describes that
+    source and pipeline version.  Returns the manifest; its ``written``
+    entry lists the tables rewritten by this call.
+    """
+    _require_pyarrow()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(directory)
+    previous = manifest.get("tables", {})
+
+    source = None if df is not None else f"{cache_key(path)}:{EXPORT_VERSION}"
+    if (not force and source is not None and manifest.get("source") == source
+            and all((directory / t["file"]).exists() for t in previous.values())):
+        return {**manifest, "written": []}
+
+    if df is None:
+        df = load_enriched(path)
+    tables = {"enriched": df.reset_index(drop=True), **aggregate_tables(df)}
+
+    entries, written = {}, []
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for name, frame in tables.items():
+        digest = fingerprint(frame)
+        entry = previous.get(name)
+        target = directory / f"{name}.arrow"
+        if force or entry is None or entry["fingerprint"] != digest or not target.exists():
+            _write_table(frame, target)
+            written.append(name)
+            entry = {"file": target.name, "fingerprint": digest, "updated": now}
+        entries[name] = {**entry, "rows": len(frame), "columns": list(map(str, frame.columns))}
+
+    for name, entry in previous.items():
+        if name not in entries:
+            (directory / entry["file"]).unlink(missing_ok=True)
+
+    manifest = {"format": "arrow-ipc", "export_version": EXPORT_VERSION,
+                "pipeline_version": PIPELINE_VERSION, "source": source, "updated": now,
+                "tables": entries}
+    _atomic_write_text(directory / MANIFEST, json.dumps(manifest, indent=1))
+    return {**manifest, "written": written}
+
+
+def attach(directory: str | os.PathLike, name: str):
+    """Memory-map published table *name* as a ``pyarrow.Table`` (no parse, no copy)."""
+    pa = _require_pyarrow()
+    entry = read_manifest(directory)["tables"].get(name)
+    if entry is None:
+        raise KeyError(f"no table {name!r} in {directory}")
+    source = pa.memory_map(str(Path(directory) / entry["file"]), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Publish the Dune sales tables as Arrow IPC files.")
+    parser.add_argument("--source", help="CSV export (default: $DUNE_SALES_CSV or the bundled file)")
+    parser.add_argument("--out", required=True, help="shared directory to publish into")
+    parser.add_argument("--force", action="store_true", help="rewrite every table")
+    args = parser.parse_args(argv)
+
+    manifest = publish(args.out, args.source, force=args.force)
+    written = manifest["written"]
+    print(f"{len(written)} of {len(manifest['tables'])} tables written to {args.out}"
+          + (f": {', '.join(written)}" if written else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Derived columns added to the cleaned sales frame."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .dates import MONTH_NAMES, add_date_parts
+
+#: Bump whenever a derivation below changes so cached frames are rebuilt.
+PIPELINE_VERSION = "5"
+
+#: Upper (inclusive) edges of the age bands; the last band is open-ended.
+AGE_EDGES = (25, 40, 50)
+AGE_LABELS = ('<=25 Young Adult', '26-40 Adult', '41-50 Old Adult', '>=51 Elder')
+
+PROFIT_LABELS = ('Loss', 'Profit')
+
+
+def age_bands(ages: pd.Series, edges=AGE_EDGES, labels=AGE_LABELS) -> pd.Series:
+    """Bin *ages* into categorical bands, right edges inclusive.
+
+    With the defaults this reproduces the notebook's ``age_group`` function.
+    """
+    if len(labels) != len(edges) + 1:
+        raise ValueError(f"{len(edges)} edges need {len(edges) + 1} labels, got {len(labels)}")
+    bins = [-np.inf, *edges, np.inf]
+    return pd.cut(ages, bins=bins, labels=list(labels), right=True)
+
+
+def profit_labels(profit: pd.Series) -> pd.Series:
+    """Label each transaction ``'Profit'`` (``profit >= 0``) or ``'Loss'``.
+
+    Matches the notebook's ``porl``, including ``'Loss'`` for NaN profit.
+    """
+    codes = (profit.to_numpy() >= 0).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, PROFIT_LABELS),
+                     index=profit.index, name=profit.name)
+
+
+def add_money(df: pd.DataFrame) -> pd.DataFrame:
+    """Add ``cost``, ``revenue`` and ``profit`` per transaction."""
+    df['cost'] = df['Quantity'] * df['Unit_Cost']
+    df['revenue'] = df['Quantity'] * df['Unit_Price']
+    df['profit'] = df['revenue'] - df['cost']
+    return df
+
+
+def add_labels(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the ``age_group`` band and the ``profit_label`` sign."""
+    df['age_group'] = age_bands(df['Customer_Age'])
+    df['profit_label'] = profit_labels(df['profit'])
+    return df
+
+
+def enrich(df: pd.DataFrame) -> pd.DataFrame:
+    """Add every derived column the EDA uses to a cleaned frame."""
+    df = add_date_parts(df)
+    df = add_money(df)
+    return add_labels(df)
+
+
+def month_names(month: pd.Series) -> pd.Series:
+    """Calendar month names for month numbers, as a categorical in calendar order."""
+    codes = month.to_numpy().astype(np.int8) - 1
+    return pd.Series(pd.Categorical.from_codes(codes, MONTH_NAMES),
+                     index=month.index, name='month_name')
+
+
+#: Columns that are pure functions of other columns and can be derived on access.
+LAZY_COLUMNS = {
+    'profit_label': lambda df: profit_labels(df['profit']).rename('profit_label'),
+    'month_name': lambda df: month_names(df['month']),
+}
+
+
+def column(df: pd.DataFrame, name: str) -> pd.Series:
+    """``df[name]``, deriving it from :data:`LAZY_COLUMNS` if it is not stored."""
+    if name in df:
+        return df[name]
+    if name in LAZY_COLUMNS:
+        return LAZY_COLUMNS[name](df)
+    raise KeyError(name)
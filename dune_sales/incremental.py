@@ -0,0 +1,114 @@
+"""Running aggregates that new daily sales files are folded into.
+
+An :class:`AggregateStore` keeps one persisted :class:`~dune_sales.aggregates.Cube`
+(sums, counts, minima and maxima per observed cell, which includes every
+year-month) and a manifest of the batches already folded in.  Appending a
+file reads and aggregates only that file, then merges its cube into the
+stored one, so a refresh costs time proportional to the new rows.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+from .aggregates import Cube
+from .cache import file_digest
+from .features import PIPELINE_VERSION, enrich
+from .load import DEFAULT_CHUNKSIZE, iter_chunks
+
+
+class StaleAggregatesError(RuntimeError):
+    """Raised when the store was built by a different pipeline version."""
+
+
+class AggregateStore:
+    """Persisted running aggregates in *directory*.
+
+    ``cube.npz`` holds the merged cube and ``manifest.json`` records the
+    pipeline version and the SHA-256 of every folded batch, so appending the
+    same file twice is a no-op.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.cube_path = self.directory / "cube.npz"
+        self.manifest_path = self.directory / "manifest.json"
+        self._cube: Cube | None = None
+
+    def manifest(self) -> dict:
+        try:
+            manifest = json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return {"pipeline_version": PIPELINE_VERSION, "batches": {}}
+        if manifest["pipeline_version"] != PIPELINE_VERSION:
+            raise StaleAggregatesError(
+                f"{self.directory} was built by pipeline version "
+                f"{manifest['pipeline_version']}, current is {PIPELINE_VERSION}; "
+                "rebuild it from the source files")
+        return manifest
+
+    @property
+    def cube(self) -> Cube | None:
+        """The merged cube, or ``None`` before the first batch."""
+        if self._cube is None and self.cube_path.exists():
+            self.manifest()
+            self._cube = Cube.load(self.cube_path)
+        return self._cube
+
+    def append(self, path: str | os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE) -> int:
+        """Fold the sales file at *path* into the store.
+
+        Returns the number of transactions added, ``0`` if the file had
+        already been folded in.
+        """
+        manifest = self.manifest()
+        digest = file_digest(path)
+        if digest in manifest["batches"]:
+            return 0
+        batch = Cube.from_chunks(enrich(c) for c in iter_chunks(path, chunksize))
+        current = self.cube
+        merged = batch if current is None else current.merge(batch)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        merged.save(self.cube_path)
+        manifest["batches"][digest] = {"path": str(Path(path).resolve()), "rows": batch.rows}
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(manifest, indent=1))
+        os.replace(tmp, self.manifest_path)
+        self._cube = merged
+        return batch.rows
+
+    def extend(self, paths: Iterable[str | os.PathLike],
+               chunksize: int = DEFAULT_CHUNKSIZE) -> int:
+        """:meth:`append` each of *paths*; returns the total rows added."""
+        return sum(self.append(p, chunksize) for p in paths)
+
+    def rebuild(self, paths: Iterable[str | os.PathLike],
+                chunksize: int = DEFAULT_CHUNKSIZE) -> int:
+        """Discard the stored aggregates and fold *paths* from scratch."""
+        self.cube_path.unlink(missing_ok=True)
+        self.manifest_path.unlink(missing_ok=True)
+        self._cube = None
+        return self.extend(paths, chunksize)
+
+    def _require_cube(self) -> Cube:
+        cube = self.cube
+        if cube is None:
+            raise LookupError(f"no batches have been folded into {self.directory}")
+        return cube
+
+    def monthly_profit(self) -> pd.DataFrame:
+        """The EDA's ``pivot_table(values='profit', index='year', columns='month')``."""
+        return self._require_cube().pivot("year", "month")
+
+    def by_year_month(self, measures: Iterable[str] | None = None) -> pd.DataFrame:
+        """Sum, count, min and max per year-month."""
+        return self._require_cube().rollup("year", "month", measures=measures, extrema=True)
+
+    def by_dimension(self, dim: str, measures: Iterable[str] | None = None) -> pd.DataFrame:
+        """Sum, count, min and max per label of *dim*."""
+        return self._require_cube().rollup(dim, measures=measures, extrema=True)
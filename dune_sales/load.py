@@ -0,0 +1,111 @@
+"""Bounded-memory ingestion of the Dune sales export.
+
+The notebook read the whole file with one ``pd.read_csv`` call against a
+hard-coded Windows path.  This module reads the CSV in fixed-size chunks
+with explicit dtypes so that peak memory is governed by ``chunksize`` rather
+than by the size of the export.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .clean import clean_chunk
+
+#: Environment variable that overrides the location of the sales export.
+PATH_ENV = "DUNE_SALES_CSV"
+
+#: The export shipped with the repository.
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "Dune Sales Data.csv"
+
+DEFAULT_CHUNKSIZE = 250_000
+
+CATEGORY_COLUMNS = (
+    "Customer",
+    "Sales Person",
+    "Customer_Gender",
+    "State",
+    "Product_Category",
+    "Sub_Category",
+    "Payment Option",
+)
+
+# Integer columns are read as nullable so rows with gaps survive the parse,
+# and wide enough that out-of-range values cannot wrap; ``clean_chunk``
+# range-checks and narrows them to plain numpy ints once the gaps are dropped.
+DTYPES = {
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    # Dates repeat heavily, so parsing the categories is far cheaper than the rows.
+    "Date": "category",
+    "Quantity": "Int32",
+    "Customer_Age": "Int32",
+    "Unit_Cost": "float32",
+    "Unit_Price": "float32",
+}
+
+
+def resolve_path(path: str | os.PathLike | None = None) -> Path:
+    """Return the CSV location: *path*, else ``$DUNE_SALES_CSV``, else the bundled file."""
+    if path is None:
+        path = os.environ.get(PATH_ENV, DEFAULT_PATH)
+    return Path(path)
+
+
+def iter_raw_chunks(path: str | os.PathLike | None = None,
+                    chunksize: int = DEFAULT_CHUNKSIZE,
+                    usecols: Iterable[str] | None = None) -> Iterator[pd.DataFrame]:
+    """Yield typed but otherwise untouched chunks of the sales export."""
+    usecols = list(usecols) if usecols is not None else None
+    dtypes = DTYPES if usecols is None else {c: DTYPES[c] for c in usecols if c in DTYPES}
+    with pd.read_csv(resolve_path(path), dtype=dtypes, usecols=usecols,
+                     chunksize=chunksize) as reader:
+        yield from reader
+
+
+def iter_chunks(path: str | os.PathLike | None = None,
+                chunksize: int = DEFAULT_CHUNKSIZE,
+                usecols: Iterable[str] | None = None,
+                fixes: Mapping[str, Mapping[str, str]] | None = None) -> Iterator[pd.DataFrame]:
+    """Yield cleaned chunks of the sales export.
+
+    Each chunk has had incomplete rows dropped, its integer columns
+    narrowed and *fixes* applied; see :func:`dune_sales.clean.clean_chunk`.
+    Only one chunk is alive at a time, so callers that fold chunks into
+    aggregates run in memory proportional to *chunksize*.
+    """
+    for chunk in iter_raw_chunks(path, chunksize, usecols):
+        yield clean_chunk(chunk, fixes)
+
+
+def concat_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate chunks, unifying per-chunk categories instead of decaying to object."""
+    chunks = list(chunks)
+    if not chunks:
+        raise ValueError("no chunks to concatenate")
+    if len(chunks) == 1:
+        return chunks[0]
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            unified = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(unified)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_raw(path: str | os.PathLike | None = None,
+             chunksize: int = DEFAULT_CHUNKSIZE,
+             usecols: Iterable[str] | None = None) -> pd.DataFrame:
+    """Load the typed export without cleaning, e.g. to inspect missing values."""
+    return concat_chunks(iter_raw_chunks(path, chunksize, usecols))
+
+
+def load_sales(path: str | os.PathLike | None = None,
+               chunksize: int = DEFAULT_CHUNKSIZE,
+               usecols: Iterable[str] | None = None,
+               fixes: Mapping[str, Mapping[str, str]] | None = None) -> pd.DataFrame:
+    """Load the whole cleaned export into one frame."""
+    return concat_chunks(iter_chunks(path, chunksize, usecols, fixes))
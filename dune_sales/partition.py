@@ -0,0 +1,71 @@
+"""Partitioned execution over many sales files in a process pool.
+
+Production exports arrive as one file per State or per month.  Each file is
+a partition: a worker loads, cleans and enriches it chunk by chunk and
+returns its partial :class:`~dune_sales.aggregates.Cube`.  The parent merges
+the partial cubes in input order, so the result does not depend on the
+number of workers or on which worker finishes first.
+"""
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .aggregates import DIMENSIONS, MEASURES, Cube
+from .features import enrich
+from .load import DEFAULT_CHUNKSIZE, iter_chunks
+
+
+def expand_sources(spec: str | os.PathLike | Iterable[str | os.PathLike]) -> list[Path]:
+    """Resolve a directory, a glob pattern or an explicit list into sorted CSV paths."""
+    if isinstance(spec, (str, os.PathLike)):
+        path = Path(spec)
+        if path.is_dir():
+            paths = list(path.glob("*.csv"))
+        elif path.exists():
+            paths = [path]
+        else:
+            paths = [Path(p) for p in glob.glob(str(spec))]
+    else:
+        paths = [Path(p) for p in spec]
+    if not paths:
+        raise FileNotFoundError(f"no sales files match {spec!r}")
+    return sorted(paths)
+
+
+def aggregate_partition(path: str | os.PathLike, chunksize: int = DEFAULT_CHUNKSIZE,
+                        dims: Sequence[str] = DIMENSIONS,
+                        measures: Sequence[str] = MEASURES) -> Cube:
+    """Load → clean → enrich → aggregate one partition."""
+    return Cube.from_chunks((enrich(c) for c in iter_chunks(path, chunksize)), dims, measures)
+
+
+def _merge_all(cubes: Iterable[Cube]) -> Cube:
+    merged = None
+    for cube in cubes:
+        merged = cube if merged is None else merged.merge(cube)
+    return merged
+
+
+def aggregate_partitions(spec: str | os.PathLike | Iterable[str | os.PathLike],
+                         workers: int | None = None,
+                         chunksize: int = DEFAULT_CHUNKSIZE,
+                         dims: Sequence[str] = DIMENSIONS,
+                         measures: Sequence[str] = MEASURES) -> Cube:
+    """Aggregate every partition in *spec* and merge the partial cubes.
+
+    *workers* defaults to the CPU count (capped at the number of
+    partitions); ``workers=1`` runs in-process.  Partials are merged in
+    sorted path order either way, so every worker count yields the same
+    cube.
+    """
+    paths = expand_sources(spec)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    args = ([chunksize] * len(paths), [tuple(dims)] * len(paths), [tuple(measures)] * len(paths))
+    if workers == 1:
+        return _merge_all(map(aggregate_partition, paths, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge_all(pool.map(aggregate_partition, paths, *args))
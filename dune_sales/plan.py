@@ -0,0 +1,265 @@
+"""Lazy query plans over the sales export.
+
+A :class:`Query` only describes load → clean → derive → aggregate; nothing
+is read until :meth:`Query.collect`.  When it runs, the plan is optimized:
+
+* **projection pushdown** — only the raw columns needed by the output,
+  the filters and the derivations they depend on are read from the CSV;
+* **predicate pushdown** — filters on raw columns run on each chunk right
+  after it is read, before cleaning and derivation (the known value fixes
+  are applied to filtered columns first, so results match the eager
+  pipeline); filters on derived columns run as soon as the columns they
+  need have been derived;
+* **dead derivation elimination** — derived columns nobody asked for
+  (e.g. ``month_name``) are never computed.
+
+For example, profit by payment option for Lagos in 2016::
+
+    (scan().filter(State="Lagos", year=2016)
+           .groupby("Payment Option").agg(profit="sum")
+           .collect())
+
+reads only ``State``, ``Date``, ``Payment Option``, ``Quantity``,
+``Unit_Cost`` and ``Unit_Price``.  :meth:`Query.explain` prints the plan.
+
+Rows with missing values are dropped based on the columns that are read,
+so a row missing only an unread column is kept.
+"""
+from __future__ import annotations
+
+import operator
+import os
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterator, NamedTuple
+
+import pandas as pd
+
+from .clean import KNOWN_FIXES, apply_fixes, clean_chunk
+from .dates import decompose_dates
+from .features import age_bands, profit_labels
+from .load import DEFAULT_CHUNKSIZE, DTYPES, iter_raw_chunks
+
+RAW_COLUMNS = tuple(DTYPES)
+
+DATE_PARTS = ("year", "month", "month_name", "quarter")
+
+#: Derived column -> columns it is computed from.
+DERIVATIONS: dict[str, tuple[str, ...]] = {
+    **{part: ("Date",) for part in DATE_PARTS},
+    "cost": ("Quantity", "Unit_Cost"),
+    "revenue": ("Quantity", "Unit_Price"),
+    "profit": ("cost", "revenue"),
+    "age_group": ("Customer_Age",),
+    "profit_label": ("profit",),
+}
+
+_COMPUTE: dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    "cost": lambda df: df["Quantity"] * df["Unit_Cost"],
+    "revenue": lambda df: df["Quantity"] * df["Unit_Price"],
+    "profit": lambda df: df["revenue"] - df["cost"],
+    "age_group": lambda df: age_bands(df["Customer_Age"]),
+    "profit_label": lambda df: profit_labels(df["profit"]),
+}
+
+_OPS: dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge, "in": lambda s, v: s.isin(v),
+}
+
+AGGREGATIONS = ("sum", "count", "mean", "min", "max")
+
+
+class Predicate(NamedTuple):
+    column: str
+    op: str
+    value: Any
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        return _OPS[self.op](df[self.column], self.value)
+
+    def __str__(self) -> str:
+        return f"{self.column} {self.op} {self.value!r}"
+
+
+def _closure(columns) -> list[str]:
+    """Every column needed to produce *columns*, in dependency order."""
+    order: list[str] = []
+
+    def visit(col: str) -> None:
+        if col in order:
+            return
+        for dep in DERIVATIONS.get(col, ()):
+            visit(dep)
+        order.append(col)
+
+    for col in columns:
+        visit(col)
+    return order
+
+
+def _derive(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Add the derived *columns* (already in dependency order) that are missing."""
+    todo = [c for c in columns if c in DERIVATIONS and c not in df]
+    parts = [c for c in todo if c in DATE_PARTS]
+    if parts:
+        decomposed = decompose_dates(df["Date"])
+        df = df.assign(**{p: decomposed[p] for p in parts})
+    for col in todo:
+        if col not in DATE_PARTS:
+            df = df.assign(**{col: _COMPUTE[col](df)})
+    return df
+
+
+@dataclass(frozen=True)
+class Query:
+    path: str | os.PathLike | None = None
+    chunksize: int = DEFAULT_CHUNKSIZE
+    predicates: tuple[Predicate, ...] = ()
+    columns: tuple[str, ...] | None = None
+    keys: tuple[str, ...] = ()
+    aggs: dict[str, tuple[str, str]] = field(default_factory=dict)
+
+    def filter(self, *predicates: Predicate | tuple, **equals: Any) -> "Query":
+        """Keep rows matching every predicate; ``State="Lagos"`` means equality.
+
+        Positional predicates are ``(column, op, value)`` with *op* one of
+        ``== != < <= > >= in``.
+        """
+        new = [Predicate(*p) for p in predicates]
+        new += [Predicate(c, "in" if isinstance(v, (list, tuple, set)) else "==", v)
+                for c, v in equals.items()]
+        for p in new:
+            if p.op not in _OPS:
+                raise ValueError(f"unknown operator {p.op!r}")
+        return replace(self, predicates=self.predicates + tuple(new))
+
+    def select(self, *columns: str) -> "Query":
+        """Return only *columns* (raw or derived) from :meth:`collect`."""
+        return replace(self, columns=columns)
+
+    def groupby(self, *keys: str) -> "Query":
+        return replace(self, keys=keys)
+
+    def agg(self, **aggs: str | tuple[str, str]) -> "Query":
+        """Aggregations ``name="func"`` (over column *name*) or ``name=(column, func)``."""
+        spec = {}
+        for name, how in aggs.items():
+            column, func = (name, how) if isinstance(how, str) else how
+            if func not in AGGREGATIONS:
+                raise ValueError(f"unknown aggregation {func!r}")
+            spec[name] = (column, func)
+        return replace(self, aggs=spec)
+
+    # -- planning ---------------------------------------------------------
+
+    def _outputs(self) -> list[str]:
+        if self.aggs:
+            return list(self.keys) + [c for c, _ in self.aggs.values()]
+        if self.columns is not None:
+            return list(self.columns)
+        return list(RAW_COLUMNS) + list(DERIVATIONS)
+
+    def _stages(self) -> tuple[list[str], list[Predicate], list[tuple[list[str], list[Predicate]]]]:
+        """Raw columns to read, raw predicates, then (derive, filter) steps."""
+        needed = _closure(self._outputs() + [p.column for p in self.predicates])
+        for col in needed:
+            if col not in RAW_COLUMNS and col not in DERIVATIONS:
+                raise KeyError(f"unknown column {col!r}")
+        raw = [c for c in RAW_COLUMNS if c in needed]
+        early = [p for p in self.predicates if p.column in RAW_COLUMNS]
+        late = [p for p in self.predicates if p.column not in RAW_COLUMNS]
+        steps, derived = [], set()
+        for p in late:
+            cols = [c for c in _closure([p.column]) if c in DERIVATIONS and c not in derived]
+            derived.update(cols)
+            steps.append((cols, [p]))
+        rest = [c for c in needed if c in DERIVATIONS and c not in derived]
+        steps.append((rest, []))
+        return raw, early, steps
+
+    def explain(self) -> str:
+        raw, early, steps = self._stages()
+        lines = [f"scan {self.path or '<default export>'} columns={raw}"]
+        fixed = sorted({p.column for p in early if p.column in KNOWN_FIXES})
+        if fixed:
+            lines.append(f"  fix values {fixed}")
+        if early:
+            lines.append("  filter " + " and ".join(map(str, early)))
+        lines.append("  clean (dropna on read columns, narrow ints, fixes)")
+        for cols, preds in steps:
+            if cols:
+                lines.append(f"  derive {cols}")
+            if preds:
+                lines.append("  filter " + " and ".join(map(str, preds)))
+        if self.aggs:
+            specs = ", ".join(f"{n}={f}({c})" for n, (c, f) in self.aggs.items())
+            lines.append(f"  aggregate by {list(self.keys)}: {specs}")
+        elif self.columns is not None:
+            lines.append(f"  select {list(self.columns)}")
+        return "\n".join(lines)
+
+    # -- execution --------------------------------------------------------
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Run the plan up to (not including) aggregation, one chunk at a time."""
+        raw, early, steps = self._stages()
+        outputs = self._outputs()
+        # Early filters must see corrected values (``Customer == "High"`` has to
+        # match the ``Hign`` typo too), so fix the filtered columns first.
+        fixes = {p.column: KNOWN_FIXES[p.column] for p in early if p.column in KNOWN_FIXES}
+        for chunk in iter_raw_chunks(self.path, self.chunksize, usecols=raw):
+            if fixes:
+                chunk = apply_fixes(chunk, fixes)
+            for p in early:
+                chunk = chunk[p(chunk).fillna(False).to_numpy(dtype=bool)]
+            chunk = clean_chunk(chunk)
+            for cols, preds in steps:
+                chunk = _derive(chunk, cols)
+                for p in preds:
+                    chunk = chunk[p(chunk).to_numpy(dtype=bool)]
+            if not self.aggs:
+                if "Date" in outputs and "Date" in chunk:
+                    chunk = chunk.assign(Date=decompose_dates(chunk["Date"])["Date"])
+                if self.columns is not None:
+                    chunk = chunk[list(self.columns)]
+            yield chunk
+
+    def collect(self) -> pd.DataFrame:
+        """Execute the plan and return the filtered rows or the aggregate table."""
+        if not self.aggs:
+            chunks = list(self.iter_chunks())
+            return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+        value_cols = sorted({c for c, _ in self.aggs.values()})
+        partials = []
+        for chunk in self.iter_chunks():
+            grouped = chunk.groupby(list(self.keys), observed=True)[value_cols] if self.keys \
+                else chunk[value_cols].groupby(lambda _: 0)
+            partials.append(grouped.agg(["sum", "count", "min", "max"]))
+        if not partials:
+            return pd.DataFrame(columns=list(self.aggs))
+        both = pd.concat(partials)
+        # Partials are indexed by categorical labels; only combine observed
+        # groups, or unseen label combinations come back as empty rows.
+        level = list(range(both.index.nlevels))
+        stats = {stat: both.xs(stat, axis=1, level=1).groupby(level=level, observed=True)
+                 for stat in ("sum", "count", "min", "max")}
+        combined = pd.concat({
+            "sum": stats["sum"].sum(),
+            "count": stats["count"].sum(),
+            "min": stats["min"].min(),
+            "max": stats["max"].max(),
+        }, axis=1)
+        out = {}
+        for name, (col, func) in self.aggs.items():
+            out[name] = (combined[("sum", col)] / combined[("count", col)] if func == "mean"
+                         else combined[(func, col)])
+        result = pd.DataFrame(out)
+        if not self.keys:
+            result = result.reset_index(drop=True)
+        return result
+
+
+def scan(path: str | os.PathLike | None = None, chunksize: int = DEFAULT_CHUNKSIZE) -> Query:
+    """Start a lazy query over the export at *path*."""
+    return Query(path, chunksize)
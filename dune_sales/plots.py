@@ -0,0 +1,232 @@
+"""Plotting layer that draws from pre-aggregated tables.
+
+Seaborn's ``countplot``/``barplot``/``lineplot`` take the transaction frame,
+recount or re-average it, and for bars and lines bootstrap a confidence
+interval over every row.  The helpers here take the already aggregated
+table instead (a Series for one bar per label, a DataFrame for grouped bars
+or one line per row) and hand it straight to matplotlib, so drawing cost
+depends on the number of bars, not the number of transactions.
+
+Error bars are opt-in: compute them with :func:`bootstrap_ci` (which does
+touch the rows, on a bounded sample per group) and pass them as *errors*.
+matplotlib is imported only when an axes has to be created.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sampling import reservoir_sample
+
+
+def _axes(ax):
+    if ax is None:
+        import matplotlib.pyplot as plt
+        ax = plt.gca()
+    return ax
+
+
+def _as_frame(data: pd.Series | pd.DataFrame) -> pd.DataFrame:
+    return data.to_frame() if isinstance(data, pd.Series) else data
+
+
+def _error_span(values: np.ndarray, errors, col) -> np.ndarray | None:
+    if errors is None:
+        return None
+    lower, upper = (_as_frame(e)[col].to_numpy() for e in errors)
+    return np.vstack([values - lower, upper - values])
+
+
+def bars(data: pd.Series | pd.DataFrame, ax=None, horizontal: bool = False,
+         label: bool = False, errors: tuple | None = None, title: str | None = None):
+    """Draw bars from an aggregated table.
+
+    A Series gives one bar per index label.  A DataFrame gives one group per
+    row with one bar per column (the ``hue``).  *errors* is an optional
+    ``(lower, upper)`` pair of tables shaped like *data*; *label* writes
+    each bar's value on it, like ``ax.bar_label`` in the notebook.
+    """
+    ax = _axes(ax)
+    frame = _as_frame(data)
+    n_groups, n_hue = frame.shape
+    pos = np.arange(n_groups)
+    width = 0.8 / max(n_hue, 1)
+    for j, col in enumerate(frame.columns):
+        values = frame[col].to_numpy(dtype=float)
+        offsets = pos - 0.4 + width * (j + 0.5)
+        span = _error_span(values, errors, col)
+        hue_label = str(col) if n_hue > 1 else None
+        if horizontal:
+            container = ax.barh(offsets, values, height=width, xerr=span, label=hue_label)
+        else:
+            container = ax.bar(offsets, values, width=width, yerr=span, label=hue_label)
+        if label:
+            ax.bar_label(container, labels=frame[col].to_numpy())
+    ticks = [str(v) for v in frame.index]
+    if horizontal:
+        ax.set_yticks(pos, ticks)
+        ax.invert_yaxis()
+        ax.set_ylabel(frame.index.name or "")
+    else:
+        ax.set_xticks(pos, ticks)
+        ax.set_xlabel(frame.index.name or "")
+    if n_hue > 1:
+        ax.legend(title=frame.columns.name)
+    if title:
+        ax.set_title(title)
+    return ax
+
+
+def count_bars(counts: pd.Series, ax=None, horizontal: bool = False,
+               label: bool = True, title: str | None = None):
+    """``sns.countplot`` from a ``value_counts`` Series; order and bar labels come from the same Series."""
+    return bars(counts, ax=ax, horizontal=horizontal, label=label, title=title)
+
+
+def lines(pivot: pd.DataFrame, ax=None, errors: tuple | None = None,
+          title: str | None = None):
+    """One line per row of *pivot* over its columns (e.g. year × month).
+
+    *errors* is an optional ``(lower, upper)`` pair shaped like *pivot*,
+    drawn as a shaded band.
+    """
+    ax = _axes(ax)
+    x = pivot.columns.to_numpy()
+    for key, row in pivot.iterrows():
+        (line,) = ax.plot(x, row.to_numpy(dtype=float), marker="o", label=str(key))
+        if errors is not None:
+            lower, upper = (e.loc[key].to_numpy(dtype=float) for e in errors)
+            ax.fill_between(x, lower, upper, color=line.get_color(), alpha=0.2)
+    ax.set_xlabel(pivot.columns.name or "")
+    ax.legend(title=pivot.index.name)
+    if title:
+        ax.set_title(title)
+    return ax
+
+
+def pie(counts: pd.Series, ax=None, donut: bool = False, title: str | None = None):
+    """Pie (or donut) of a counts Series."""
+    ax = _axes(ax)
+    ax.pie(counts.to_numpy(), labels=counts.index,
+           autopct='%1.1f%%' if donut else '%.2f%%',
+           wedgeprops={'width': 0.6} if donut else None)
+    if title:
+        ax.set_title(title)
+    return ax
+
+
+def bootstrap_ci(df: pd.DataFrame, by: str | Sequence[str], y: str, n_boot: int = 1000,
+                 ci: float = 95, max_rows: int = 10_000, seed: int | None = 0) -> pd.DataFrame:
+    """Bootstrap a confidence interval of the mean of *y* per group of *by*.
+
+    Returns ``mean``, ``lower`` and ``upper`` per group.  The mean is exact;
+    the interval is resampled from at most *max_rows* rows per group, so its
+    cost is bounded regardless of group size.
+    """
+    rng = np.random.default_rng(seed)
+    alpha = (100 - ci) / 2
+    out = {}
+    for key, values in df.groupby(by, observed=True)[y]:
+        values = values.to_numpy(dtype=float)
+        sample = (rng.choice(values, max_rows, replace=False)
+                  if len(values) > max_rows else values)
+        means = np.empty(n_boot)
+        step = max(1, 1_000_000 // max(len(sample), 1))
+        for start in range(0, n_boot, step):
+            stop = min(start + step, n_boot)
+            idx = rng.integers(0, len(sample), (stop - start, len(sample)))
+            means[start:stop] = sample[idx].mean(axis=1)
+        lower, upper = np.percentile(means, [alpha, 100 - alpha])
+        out[key] = (values.mean(), lower, upper)
+    result = pd.DataFrame.from_dict(out, orient="index", columns=["mean", "lower", "upper"])
+    result.index.names = [by] if isinstance(by, str) else list(by)
+    return result
+
+
+#: Numeric columns shown by :func:`pairplot`; chosen explicitly rather than "every number".
+PAIR_COLUMNS = ("Customer_Age", "Quantity", "Unit_Cost", "Unit_Price", "cost", "revenue", "profit")
+
+#: Above this many rows, scatter panels become 2-D histograms over all rows.
+DENSITY_THRESHOLD = 50_000
+
+
+def _density(ax, x: np.ndarray, y: np.ndarray, bins: int) -> None:
+    counts, xedges, yedges = np.histogram2d(x, y, bins=bins)
+    ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+
+
+def scatter(df: pd.DataFrame, x: str, y: str, ax=None, cap: int = 5_000,
+            by: str | None = None, density_above: int = DENSITY_THRESHOLD,
+            bins: int = 50, seed: int | None = 0, title: str | None = None):
+    """Scatter *y* against *x* with bounded cost.
+
+    Up to *density_above* rows, draws a stratified reservoir sample of at
+    most *cap* points; above it, draws a 2-D histogram of every row, whose
+    cost is one vectorized pass and a fixed ``bins × bins`` mesh.
+    """
+    ax = _axes(ax)
+    if len(df) > density_above:
+        _density(ax, df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float), bins)
+    else:
+        sample = reservoir_sample(df[[x, y] + ([by] if by else [])], cap, by, seed)
+        ax.scatter(sample[x], sample[y], s=8, alpha=0.5)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    if title:
+        ax.set_title(title)
+    return ax
+
+
+def pairplot(df: pd.DataFrame, columns: Sequence[str] = PAIR_COLUMNS, cap: int = 5_000,
+             by: str | None = None, density_above: int = DENSITY_THRESHOLD,
+             bins: int = 40, height: float = 2.5, seed: int | None = 0):
+    """Bounded-cost replacement for ``sns.pairplot(df, height=2.5)``.
+
+    Diagonal panels are histograms of every row.  Off-diagonal panels are
+    scatters of one shared stratified sample (see :func:`scatter`), or 2-D
+    histograms once the frame exceeds *density_above* rows.  Returns the
+    matplotlib figure.
+    """
+    import matplotlib.pyplot as plt
+    columns = list(columns)
+    k = len(columns)
+    fig, axs = plt.subplots(k, k, figsize=(height * k, height * k), squeeze=False)
+    dense = len(df) > density_above
+    values = {c: df[c].to_numpy(dtype=float) for c in columns}
+    sample = None if dense else reservoir_sample(
+        df[columns + ([by] if by else [])], cap, by, seed)
+    for i, yc in enumerate(columns):
+        for j, xc in enumerate(columns):
+            ax = axs[i, j]
+            if i == j:
+                counts, edges = np.histogram(values[xc], bins=bins)
+                ax.stairs(counts, edges, fill=True)
+            elif dense:
+                _density(ax, values[xc], values[yc], bins)
+            else:
+                ax.scatter(sample[xc], sample[yc], s=4, alpha=0.5)
+            if i == k - 1:
+                ax.set_xlabel(xc)
+            if j == 0:
+                ax.set_ylabel(yc)
+    fig.tight_layout()
+    return fig
+
+
+def null_profile(profile: pd.DataFrame, ax=None, title: str | None = None):
+    """Heatmap of a binned null-density profile (row bin × column), see :mod:`dune_sales.quality`.
+
+    Unlike ``sns.heatmap(df.isnull())`` the image has one row per bin, not
+    per transaction.
+    """
+    ax = _axes(ax)
+    image = ax.imshow(profile.to_numpy(dtype=float), aspect="auto", cmap="coolwarm",
+                      vmin=0, interpolation="nearest")
+    ax.set_xticks(np.arange(profile.shape[1]), [str(c) for c in profile.columns], rotation=90)
+    ax.set_ylabel(profile.index.name or "row bin")
+    ax.figure.colorbar(image, ax=ax, label="null share")
+    if title:
+        ax.set_title(title)
+    return ax
@@ -0,0 +1,213 @@
+"""Stage-level timing and memory instrumentation of the EDA pipeline.
+
+:class:`Profiler` wraps each logical stage in a context manager that
+records wall time, CPU time, the growth of the process's peak RSS and the
+rows the stage produced::
+
+    prof = Profiler()
+    with prof.stage("load") as rec:
+        df = load_raw()
+        rec.rows = len(df)
+    print(prof.table())
+    prof.write_json("profile.json")
+
+:func:`profile_pipeline` runs the notebook's stages — load, dropna, date
+parsing, feature derivation, every groupby/pivot, the correlation matrix
+and optionally every report figure — under a profiler::
+
+    python -m dune_sales.profiling --out profile.json --figures --cprofile prof/
+
+With ``--cprofile DIR`` each stage is also run under :mod:`cProfile` and
+its stats are dumped to ``DIR/<stage>.prof`` (readable by ``pstats``,
+snakeviz and friends).  The stages are plain Python calls, so the command
+can equally be run under ``py-spy record``; stage names are the function
+boundaries to look for.
+
+Peak RSS comes from ``getrusage``, a high-water mark: a stage that
+allocates less than an earlier stage already did shows a delta of zero.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from .aggregates import Cube
+from .clean import clean_chunk
+from .dates import add_date_parts
+from .features import add_labels, add_money
+from .load import load_raw
+from .stats import NUMERIC_COLUMNS
+
+#: Dimensions the notebook counts and sums profit over.
+BREAKDOWN_DIMENSIONS = ("Customer", "Sales Person", "Customer_Gender", "age_group", "State",
+                        "Product_Category", "Sub_Category", "Payment Option", "month_name",
+                        "profit_label")
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageRecord:
+    name: str
+    wall: float = 0.0
+    cpu: float = 0.0
+    peak_rss_delta: int = 0
+    rows: int | None = None
+
+
+def _format_stage(name: str, wall: float, cpu: float, peak_rss_delta: float,
+                  rows: int | None) -> dict[str, str]:
+    return {
+        "stage": name,
+        "wall ms": f"{wall * 1e3:,.1f}",
+        "cpu ms": f"{cpu * 1e3:,.1f}",
+        "peak rss +MiB": f"{peak_rss_delta / 2**20:,.1f}",
+        "rows": "" if rows is None or pd.isna(rows) else f"{int(rows):,}",
+    }
+
+
+class Profiler:
+    """Collects a :class:`StageRecord` per stage; *cprofile_dir* enables cProfile dumps."""
+
+    def __init__(self, cprofile_dir: str | os.PathLike | None = None):
+        self.records: list[StageRecord] = []
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir is not None else None
+        if self.cprofile_dir is not None:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None) -> Iterator[StageRecord]:
+        """Time the body; set ``rec.rows`` inside it to record the rows processed."""
+        rec = StageRecord(name, rows=rows)
+        profile = cProfile.Profile() if self.cprofile_dir is not None else None
+        rss, cpu, wall = peak_rss(), time.process_time(), time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield rec
+        finally:
+            if profile is not None:
+                profile.disable()
+            rec.wall = time.perf_counter() - wall
+            rec.cpu = time.process_time() - cpu
+            rec.peak_rss_delta = peak_rss() - rss
+            self.records.append(rec)
+            if profile is not None:
+                profile.dump_stats(self.cprofile_dir / (re.sub(r"[^\w.-]+", "_", name) + ".prof"))
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(r) for r in self.records],
+                            columns=["name", "wall", "cpu", "peak_rss_delta", "rows"])
+
+    def table(self) -> str:
+        """Human-readable summary, slowest stages first, with a total line."""
+        df = self.frame()
+        if df.empty:
+            return "(no stages recorded)"
+        # The total row is appended after formatting: concatenating it as a
+        # frame with an all-missing ``rows`` entry warns on recent pandas.
+        lines = [_format_stage(*r) for r in
+                 df.sort_values("wall", ascending=False).itertuples(index=False)]
+        lines.append(_format_stage("total", df["wall"].sum(), df["cpu"].sum(),
+                                   df["peak_rss_delta"].sum(), None))
+        return pd.DataFrame(lines).to_string(index=False)
+
+    def to_json(self) -> dict:
+        return {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "stages": [asdict(r) for r in self.records],
+        }
+
+    def write_json(self, path: str | os.PathLike) -> None:
+        Path(path).write_text(json.dumps(self.to_json(), indent=1))
+
+
+def profile_pipeline(path: str | os.PathLike | None = None, profiler: Profiler | None = None,
+                     figures: bool = False, figure_dir: str | os.PathLike | None = None) -> Profiler:
+    """Run the notebook's stages on *path* under *profiler* (a new one by default)."""
+    prof = profiler or Profiler()
+
+    with prof.stage("load") as rec:
+        df = load_raw(path)
+        rec.rows = len(df)
+    with prof.stage("dropna") as rec:
+        df = df.dropna()
+        rec.rows = len(df)
+    with prof.stage("clean") as rec:
+        df = clean_chunk(df)
+        rec.rows = len(df)
+    with prof.stage("parse dates") as rec:
+        df = add_date_parts(df)
+        rec.rows = len(df)
+    with prof.stage("derive features") as rec:
+        df = add_labels(add_money(df))
+        rec.rows = len(df)
+
+    for dim in BREAKDOWN_DIMENSIONS:
+        with prof.stage(f"value_counts {dim}", rows=len(df)):
+            df[dim].value_counts()
+        with prof.stage(f"profit by {dim}", rows=len(df)):
+            df.groupby(dim, observed=True)['profit'].sum()
+    with prof.stage("pivot year x month", rows=len(df)):
+        df.pivot_table(values='profit', index='year', columns='month', aggfunc='sum')
+    with prof.stage("melt category metrics", rows=len(df)):
+        procat = df.groupby('Product_Category', observed=True)[['cost', 'revenue', 'profit']].sum()
+        pd.melt(procat.reset_index(), id_vars='Product_Category', var_name='Metric',
+                value_name='Total')
+    with prof.stage("mean profit gender x age", rows=len(df)):
+        df.groupby(['Customer_Gender', 'age_group'], observed=True)['profit'].mean().unstack()
+    with prof.stage("corr", rows=len(df)):
+        df[list(NUMERIC_COLUMNS)].corr()
+
+    if figures:
+        from .report import FIGURES, render_figure
+
+        with prof.stage("build cube", rows=len(df)):
+            cube = Cube.from_frame(df)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(figure_dir or tmp)
+            out.mkdir(parents=True, exist_ok=True)
+            for name, spec in FIGURES.items():
+                with prof.stage(f"figure {name}"):
+                    render_figure(name, spec.compute(cube), out / f"{name}.png")
+    return prof
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Profile each stage of the Dune sales EDA.")
+    parser.add_argument("--source", help="CSV export (default: $DUNE_SALES_CSV or the bundled file)")
+    parser.add_argument("--out", default="profile.json", help="JSON file for the stage records")
+    parser.add_argument("--figures", action="store_true", help="also render every report figure")
+    parser.add_argument("--cprofile", metavar="DIR", help="dump cProfile stats per stage into DIR")
+    args = parser.parse_args(argv)
+
+    prof = profile_pipeline(args.source, Profiler(args.cprofile), figures=args.figures)
+    prof.write_json(args.out)
+    print(prof.table())
+    print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
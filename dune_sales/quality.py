@@ -0,0 +1,127 @@
+"""Single-pass data-quality scan of the raw export.
+
+The notebook checked quality with ``isnull().sum()``, a one-cell-per-value
+heatmap, ``msno.bar`` and ``df[df.isnull().any(axis=1)]`` (several full
+passes), and only noticed the ``'Hign'`` typo later from a countplot.
+:func:`scan` reads the raw chunks once and collects all of it into a
+compact :class:`QualityReport`: null counts, a binned null-density profile,
+values outside each categorical column's known domain, out-of-range ages
+and quantities, and rows whose unit cost exceeds the unit price.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .load import DEFAULT_CHUNKSIZE, iter_raw_chunks
+
+#: Allowed values of the categorical columns that have a fixed domain.
+DOMAINS = {
+    "Customer": {"High", "Medium", "Low"},
+    "Customer_Gender": {"F", "M"},
+    "Product_Category": {"Accessories", "Clothing", "Phones"},
+    "Payment Option": {"Cash", "Online", "POS"},
+}
+
+#: Inclusive plausible ranges of the integer columns.
+RANGES = {
+    "Customer_Age": (16, 100),
+    "Quantity": (1, 100),
+}
+
+#: Rows per bin of the null-density profile.
+PROFILE_BIN_ROWS = 10_000
+
+#: Row labels kept per finding as examples.
+MAX_EXAMPLES = 20
+
+
+@dataclass
+class QualityReport:
+    rows: int = 0
+    nulls: pd.Series = field(default_factory=lambda: pd.Series(dtype=np.int64))
+    incomplete_rows: int = 0
+    #: Null share per (row bin × column); bin ``i`` covers rows ``[i * bin_rows, (i + 1) * bin_rows)``.
+    null_profile: pd.DataFrame = field(default_factory=pd.DataFrame)
+    #: Counts of out-of-domain values, per column.
+    invalid: dict[str, pd.Series] = field(default_factory=dict)
+    out_of_range: dict[str, int] = field(default_factory=dict)
+    cost_above_price: int = 0
+    examples: dict[str, list] = field(default_factory=dict)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per finding with its count and share of rows."""
+        findings = {f"null {col}": n for col, n in self.nulls.items() if n}
+        findings["incomplete rows"] = self.incomplete_rows
+        for col, counts in self.invalid.items():
+            for value, n in counts.items():
+                findings[f"invalid {col} = {value!r}"] = n
+        for col, n in self.out_of_range.items():
+            findings[f"out of range {col}"] = n
+        findings["Unit_Cost > Unit_Price"] = self.cost_above_price
+        out = pd.DataFrame({"count": pd.Series(findings, dtype=np.int64)})
+        out["share"] = out["count"] / max(self.rows, 1)
+        return out
+
+    def __str__(self) -> str:
+        return f"{self.rows} rows scanned\n{self.summary().to_string()}"
+
+
+def _note(report: QualityReport, key: str, mask: np.ndarray, index: pd.Index) -> int:
+    n = int(mask.sum())
+    if n:
+        seen = report.examples.setdefault(key, [])
+        seen.extend(index[mask][:MAX_EXAMPLES - len(seen)].tolist())
+    return n
+
+
+def scan(path: str | os.PathLike | None = None, chunksize: int = DEFAULT_CHUNKSIZE,
+         bin_rows: int = PROFILE_BIN_ROWS) -> QualityReport:
+    """Scan the raw export at *path* chunk by chunk."""
+    report = QualityReport()
+    profile_nulls: list[pd.DataFrame] = []
+
+    for chunk in iter_raw_chunks(path, chunksize):
+        start = report.rows
+        report.rows += len(chunk)
+        isnull = chunk.isna()
+        report.nulls = report.nulls.add(isnull.sum(), fill_value=0).astype(np.int64)
+        report.incomplete_rows += _note(report, "incomplete rows",
+                                        isnull.any(axis=1).to_numpy(), chunk.index)
+
+        bins = (start + np.arange(len(chunk))) // bin_rows
+        profile_nulls.append(isnull.groupby(bins).sum())
+
+        for col, domain in DOMAINS.items():
+            if col not in chunk:
+                continue
+            values = chunk[col]
+            counts = values.value_counts()
+            counts = counts[(counts > 0) & ~counts.index.isin(domain)]
+            if len(counts):
+                prev = report.invalid.get(col, pd.Series(dtype=np.int64))
+                report.invalid[col] = prev.add(counts, fill_value=0).astype(np.int64)
+                _note(report, f"invalid {col}", values.isin(counts.index).to_numpy(), chunk.index)
+
+        for col, (lo, hi) in RANGES.items():
+            if col not in chunk:
+                continue
+            values = chunk[col]
+            mask = ((values < lo) | (values > hi)).fillna(False).to_numpy(dtype=bool)
+            report.out_of_range[col] = (report.out_of_range.get(col, 0)
+                                        + _note(report, f"out of range {col}", mask, chunk.index))
+
+        mask = (chunk["Unit_Cost"] > chunk["Unit_Price"]).fillna(False).to_numpy(dtype=bool)
+        report.cost_above_price += _note(report, "Unit_Cost > Unit_Price", mask, chunk.index)
+
+    if profile_nulls:
+        # A bin can straddle two chunks, so combine partial bins before dividing.
+        nulls = pd.concat(profile_nulls).groupby(level=0).sum()
+        sizes = np.full(len(nulls), bin_rows)
+        sizes[-1] = report.rows - bin_rows * (len(nulls) - 1)
+        report.null_profile = nulls.div(sizes, axis=0)
+        report.null_profile.index.name = "row_bin"
+    return report
@@ -0,0 +1,207 @@
+"""Headless batch rendering of the EDA figures and an HTML report.
+
+Every figure is declared in :data:`FIGURES` as a function of the
+aggregation cube plus a drawing function over the resulting table.  The
+tables are computed in the parent process and each figure is drawn in a
+worker process on the non-interactive ``Agg`` backend.  A fingerprint of
+every figure's input table is stored next to the images, and on a warm
+run figures whose inputs are unchanged are not redrawn.
+
+    python -m dune_sales.report --source "Dune Sales Data.csv" --out report/
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import pandas as pd
+
+from . import plots
+from .aggregates import Cube, category_metrics, profit_breakdowns
+from .load import resolve_path
+from .partition import aggregate_partitions
+
+#: Bump when a drawing function changes so every figure is redrawn.
+RENDER_VERSION = "2"
+
+
+class Figure(NamedTuple):
+    title: str
+    compute: Callable[[Cube], Any]
+    draw: Callable[[Any, Any], None]
+    figsize: tuple[float, float] = (8, 5)
+
+
+def _bar(horizontal: bool = False, label: bool = True):
+    def draw(fig, data: pd.Series) -> None:
+        plots.count_bars(data, ax=fig.subplots(), horizontal=horizontal, label=label)
+    return draw
+
+
+def _pie(donut: bool = False):
+    def draw(fig, data: pd.Series) -> None:
+        plots.pie(data, ax=fig.subplots(), donut=donut)
+    return draw
+
+
+def _profit_grid(fig, tables: dict[str, pd.DataFrame]) -> None:
+    axs = fig.subplots(2, 3)
+    for i, (ax, (dim, table)) in enumerate(zip(axs.flat, tables.items())):
+        # Top row vertical, bottom row horizontal, as in the notebook.
+        plots.bars(table.set_index(dim)['profit'], ax=ax, horizontal=i >= 3,
+                   title=f'Profit by {dim}')
+
+
+def _category_metrics(fig, procat: pd.DataFrame) -> None:
+    wide = procat.pivot(index='Product_Category', columns='Metric', values='Total')
+    plots.bars(wide, ax=fig.subplots())
+
+
+def _lines(fig, pivot: pd.DataFrame) -> None:
+    plots.lines(pivot, ax=fig.subplots())
+
+
+def _grouped_bars(fig, pivot: pd.DataFrame) -> None:
+    plots.bars(pivot, ax=fig.subplots())
+
+
+FIGURES: dict[str, Figure] = {
+    "customer_counts": Figure("Customer Frequency per Customer category",
+                              lambda c: c.value_counts("Customer"), _bar()),
+    "salesperson_counts": Figure("Count of transactions by salesperson",
+                                 lambda c: c.value_counts("Sales Person"), _bar()),
+    "age_group_counts": Figure("Count of transactions by Customer Age Group",
+                               lambda c: c.value_counts("age_group"), _bar(horizontal=True),
+                               (15, 5)),
+    "gender_share": Figure("Percentage of Transactions by Gender",
+                           lambda c: c.value_counts("Customer_Gender"), _pie(), (5, 5)),
+    "top_states": Figure("Top 10 transactions by State",
+                         lambda c: c.value_counts("State").head(10), _bar(label=False), (12, 5)),
+    "sub_category_counts": Figure("Count of transactions by Sub Category",
+                                  lambda c: c.value_counts("Sub_Category"),
+                                  _bar(horizontal=True), (13, 5)),
+    "product_category_share": Figure("Transactions by Product Category",
+                                     lambda c: c.value_counts("Product_Category"),
+                                     _pie(donut=True), (5, 5)),
+    "payment_option_share": Figure("Transactions by Payment Option",
+                                   lambda c: c.value_counts("Payment Option"),
+                                   _pie(donut=True), (5, 5)),
+    "month_counts": Figure("Count of Transactions by Month",
+                           lambda c: c.value_counts("month_name"), _bar(), (12, 5)),
+    "profit_loss_share": Figure("Percentage of Transactions by Profit or Loss",
+                                lambda c: c.value_counts("profit_label"), _pie(), (5, 5)),
+    "profit_breakdowns": Figure("Profit by dimension", profit_breakdowns, _profit_grid, (27, 10)),
+    "category_metrics": Figure("Product Category by Cost, Revenue, and Profit",
+                               category_metrics, _category_metrics),
+    "monthly_profit": Figure("Total profit per month by year",
+                             lambda c: c.pivot("year", "month"), _lines, (15, 5)),
+    "monthly_mean_profit": Figure("Mean profit per transaction by month and year",
+                                  lambda c: c.mean("year", "month").unstack("month"),
+                                  _lines, (15, 5)),
+    "gender_age_profit": Figure("Mean profit by gender and age group",
+                                lambda c: c.mean("Customer_Gender", "age_group")
+                                .unstack("age_group"),
+                                _grouped_bars, (10, 5)),
+}
+
+
+def fingerprint(data: Any) -> str:
+    """Content hash of a figure's input table (or dict of tables)."""
+    h = hashlib.sha256(RENDER_VERSION.encode())
+    items = data.items() if isinstance(data, dict) else [("", data)]
+    for key, obj in items:
+        h.update(str(key).encode())
+        if isinstance(obj, pd.DataFrame):
+            h.update(repr(list(obj.columns)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def render_figure(name: str, data: Any, path: str | os.PathLike) -> str:
+    """Draw one figure to *path*; runs in a worker process."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    spec = FIGURES[name]
+    fig = plt.figure(figsize=spec.figsize)
+    try:
+        spec.draw(fig, data)
+        fig.suptitle(spec.title)
+        fig.savefig(path, dpi=100, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return name
+
+
+def _table_html(data: Any) -> str:
+    if isinstance(data, dict):
+        return "".join(_table_html(v) for v in data.values())
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    return frame.to_html(float_format="{:,.2f}".format)
+
+
+def write_html(out_dir: Path, tables: dict[str, Any]) -> Path:
+    parts = ["<!doctype html><html><head><meta charset='utf-8'>"
+             "<title>Dune Sales Report</title></head><body><h1>Dune Sales Report</h1>"]
+    for name, data in tables.items():
+        parts.append(f"<h2>{html.escape(FIGURES[name].title)}</h2>"
+                     f"<img src='{name}.png' alt='{html.escape(name)}'>"
+                     f"<details><summary>Data</summary>{_table_html(data)}</details>")
+    parts.append("</body></html>")
+    path = out_dir / "report.html"
+    path.write_text("\n".join(parts), encoding="utf-8")
+    return path
+
+
+def render_report(cube: Cube, out_dir: str | os.PathLike, workers: int | None = None,
+                  force: bool = False, names: list[str] | None = None) -> Path:
+    """Render *names* (default: all of :data:`FIGURES`) from *cube* into *out_dir*.
+
+    Returns the path of ``report.html``.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prints_path = out_dir / "fingerprints.json"
+    try:
+        previous = json.loads(prints_path.read_text())
+    except (OSError, ValueError):
+        previous = {}
+
+    tables = {name: FIGURES[name].compute(cube) for name in names or FIGURES}
+    prints = {name: fingerprint(data) for name, data in tables.items()}
+    todo = [name for name in tables
+            if force or previous.get(name) != prints[name] or not (out_dir / f"{name}.png").exists()]
+
+    if todo:
+        paths = [out_dir / f"{name}.png" for name in todo]
+        data = [tables[name] for name in todo]
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(todo))) as pool:
+            list(pool.map(render_figure, todo, data, paths))
+
+    prints_path.write_text(json.dumps({**previous, **prints}, indent=1))
+    return write_html(out_dir, tables)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Render the Dune sales report headlessly.")
+    parser.add_argument("--source", default=None,
+                        help="CSV file, directory or glob (default: $DUNE_SALES_CSV or the bundled export)")
+    parser.add_argument("--out", default="report")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="redraw every figure")
+    args = parser.parse_args(argv)
+
+    source = args.source if args.source is not None else resolve_path()
+    cube = aggregate_partitions(source, workers=args.workers)
+    print(render_report(cube, args.out, workers=args.workers, force=args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Stratified reservoir sampling over frames or streams of chunks.
+
+Each row gets a uniform random priority and, per stratum, the rows with the
+smallest priorities are kept (bottom-k sampling, equivalent to a reservoir
+of that size).  While streaming, every stratum keeps up to *cap* rows; when
+the sample is taken the total *cap* is shared among strata in proportion to
+their size, with at least one row per stratum so rare categories still
+appear.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .load import concat_chunks
+
+_KEY = "__priority"
+
+
+class StratifiedReservoir:
+    """Bounded uniform sample of the rows seen so far, stratified by *by*."""
+
+    def __init__(self, cap: int, by: str | Sequence[str] | None = None, seed: int | None = 0):
+        if cap < 1:
+            raise ValueError("cap must be positive")
+        self.cap = cap
+        self.by = [by] if isinstance(by, str) else list(by) if by else []
+        self.rng = np.random.default_rng(seed)
+        self.seen = 0
+        self._sizes: pd.Series | None = None
+        self._pool: pd.DataFrame | None = None
+
+    def _bottom(self, df: pd.DataFrame, k) -> pd.DataFrame:
+        if not self.by:
+            return df.nsmallest(k, _KEY)
+        rank = df.groupby(self.by, observed=True)[_KEY].rank(method="first")
+        limit = k if np.isscalar(k) else k.reindex(
+            pd.MultiIndex.from_frame(df[self.by]) if len(self.by) > 1 else df[self.by[0]]
+        ).to_numpy()
+        return df[rank.to_numpy() <= limit]
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """Offer every row of *chunk* to the reservoir."""
+        self.seen += len(chunk)
+        if self.by:
+            sizes = chunk.groupby(self.by, observed=True).size()
+            self._sizes = (sizes if self._sizes is None
+                           else self._sizes.add(sizes, fill_value=0).astype(np.int64))
+        chunk = chunk.assign(**{_KEY: self.rng.random(len(chunk))})
+        pool = chunk if self._pool is None else concat_chunks([self._pool, chunk])
+        self._pool = self._bottom(pool, self.cap)
+
+    def sample(self) -> pd.DataFrame:
+        """Return about *cap* rows, shared among strata in proportion to their size.
+
+        Every stratum keeps at least one row, so with many strata the sample
+        can exceed *cap* by up to the number of strata.
+        """
+        if self._pool is None:
+            raise ValueError("no rows have been added")
+        pool = self._pool
+        if self.by:
+            quota = np.maximum(1, np.floor(self.cap * self._sizes / self.seen)).astype(np.int64)
+            pool = self._bottom(pool, quota)
+        return pool.drop(columns=_KEY).reset_index(drop=True)
+
+
+def reservoir_sample(data: pd.DataFrame | Iterable[pd.DataFrame], cap: int,
+                     by: str | Sequence[str] | None = None, seed: int | None = 0) -> pd.DataFrame:
+    """Sample at most *cap* rows from a frame or a stream of chunks.
+
+    A frame with no more than *cap* rows is returned unchanged.
+    """
+    if isinstance(data, pd.DataFrame):
+        if len(data) <= cap:
+            return data
+        data = [data]
+    reservoir = StratifiedReservoir(cap, by, seed)
+    for chunk in data:
+        reservoir.add(chunk)
+    return reservoir.sample()
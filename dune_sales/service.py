@@ -0,0 +1,267 @@
+"""Long-running HTTP service answering the EDA's breakdowns from memory.
+
+The export is loaded and enriched once into an aggregation cube; every
+request is then answered from that cube (or, for the correlation matrix,
+from the enriched frame) in a worker thread.  Answers are kept in an LRU
+cache with a time-to-live, keyed by endpoint, query parameters and the
+source file's version, and concurrent identical requests share a single
+computation.  Each request stats the source file; when its size or
+modification time changes the data is reloaded and the cache cleared.
+
+    python -m dune_sales.service --source "Dune Sales Data.csv" --port 8050
+
+Endpoints (all ``GET``, JSON responses)::
+
+    /counts?dim=State                  transactions per label
+    /profit?dim=Sales Person           profit per label
+    /pivot?index=year&columns=month    sum of ``values`` (default profit)
+                                       over two different dimensions
+    /corr                              correlation matrix of the numeric columns
+    /loss-share                        share of transactions with a loss
+    /health                            rows loaded and source version
+
+Every cube dimension is accepted as ``dim``, ``index`` or ``columns``,
+including ``quarter`` and ``month_name``, which the cube derives from
+``month``.
+
+Only the standard library's :mod:`asyncio` is used for serving, so the
+service has no dependencies beyond the pipeline's own.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from .aggregates import DERIVED, DIMENSIONS, MEASURES, Cube, loss_share
+from .features import enrich
+from .load import load_sales, resolve_path
+from .stats import NUMERIC_COLUMNS
+
+DEFAULT_PORT = 8050
+
+#: Default cache size (entries) and time-to-live (seconds).
+CACHE_SIZE = 256
+CACHE_TTL = 300.0
+
+#: Dimensions a request may group by: the stored ones and those derived from them.
+GROUPINGS = (*DIMENSIONS, *DERIVED)
+
+
+class TTLCache:
+    """LRU cache of futures whose entries also expire after *ttl* seconds.
+
+    Storing the future rather than the result lets concurrent requests for
+    the same key await one computation.  Failed computations are not kept.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, asyncio.Future]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get(self, key: Any, compute: Callable[[], Awaitable[Any]]) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return await asyncio.shield(entry[1])
+        self.misses += 1
+        future = asyncio.ensure_future(compute())
+        self._entries[key] = (now + self.ttl, future)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+
+
+class Snapshot(NamedTuple):
+    version: tuple[int, int]
+    frame: pd.DataFrame
+    cube: Cube
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _stat_version(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _load(path: Path) -> Snapshot:
+    version = _stat_version(path)
+    df = enrich(load_sales(path))
+    return Snapshot(version, df, Cube.from_frame(df))
+
+
+def _param(params: dict[str, str], name: str, allowed, default: str | None = None) -> str:
+    value = params.get(name, default)
+    if value is None:
+        raise BadRequest(f"missing parameter {name!r}")
+    if value not in allowed:
+        raise BadRequest(f"{name}={value!r} is not one of {sorted(allowed)}")
+    return value
+
+
+def _counts(snap: Snapshot, params: dict[str, str]) -> str:
+    dim = _param(params, "dim", GROUPINGS)
+    return snap.cube.value_counts(dim).to_json(orient="index")
+
+
+def _profit(snap: Snapshot, params: dict[str, str]) -> str:
+    dim = _param(params, "dim", GROUPINGS)
+    measure = _param(params, "measure", MEASURES, "profit")
+    return snap.cube.total(dim, measure).to_json(orient="index")
+
+
+def _pivot(snap: Snapshot, params: dict[str, str]) -> str:
+    index = _param(params, "index", GROUPINGS, "year")
+    columns = _param(params, "columns", GROUPINGS, "month")
+    values = _param(params, "values", MEASURES, "profit")
+    if index == columns:
+        raise BadRequest(f"index and columns must differ (both are {index!r})")
+    return snap.cube.pivot(index, columns, values).to_json(orient="split")
+
+
+def _corr(snap: Snapshot, params: dict[str, str]) -> str:
+    return snap.frame[list(NUMERIC_COLUMNS)].corr().to_json(orient="split")
+
+
+def _loss_share(snap: Snapshot, params: dict[str, str]) -> str:
+    counts = snap.cube.value_counts("profit_label")
+    return json.dumps({"loss_share": loss_share(counts), "transactions": int(counts.sum())})
+
+
+ENDPOINTS: dict[str, Callable[[Snapshot, dict[str, str]], str]] = {
+    "/counts": _counts,
+    "/profit": _profit,
+    "/pivot": _pivot,
+    "/corr": _corr,
+    "/loss-share": _loss_share,
+}
+
+
+class SalesService:
+    """Holds the loaded data and the result cache; :meth:`handle` answers one request."""
+
+    def __init__(self, path: str | os.PathLike | None = None,
+                 cache_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.path = resolve_path(path).resolve()
+        self.cache = TTLCache(cache_size, ttl)
+        self._snapshot: Snapshot | None = None
+        self._lock = asyncio.Lock()
+
+    async def snapshot(self) -> Snapshot:
+        """The loaded data, reloading first if the source file changed."""
+        version = _stat_version(self.path)
+        if self._snapshot is not None and self._snapshot.version == version:
+            return self._snapshot
+        async with self._lock:
+            if self._snapshot is None or self._snapshot.version != _stat_version(self.path):
+                loop = asyncio.get_running_loop()
+                self._snapshot = await loop.run_in_executor(None, _load, self.path)
+                self.cache.clear()
+        return self._snapshot
+
+    async def handle(self, target: str) -> tuple[HTTPStatus, str]:
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        snap = await self.snapshot()
+        if url.path == "/health":
+            return HTTPStatus.OK, json.dumps({
+                "rows": len(snap.frame), "source": str(self.path), "version": list(snap.version),
+                "cache": {"entries": len(self.cache), "hits": self.cache.hits,
+                          "misses": self.cache.misses},
+            })
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            return HTTPStatus.NOT_FOUND, json.dumps({"error": f"no endpoint {url.path}"})
+        key = (snap.version, url.path, tuple(sorted(params.items())))
+        loop = asyncio.get_running_loop()
+        try:
+            body = await self.cache.get(key, lambda: loop.run_in_executor(None, endpoint, snap, params))
+        except BadRequest as exc:
+            return HTTPStatus.BAD_REQUEST, json.dumps({"error": str(exc)})
+        return HTTPStatus.OK, body
+
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not used
+            parts = request.decode("latin-1").split()
+            if len(parts) != 3:
+                status, body = HTTPStatus.BAD_REQUEST, json.dumps({"error": "malformed request"})
+            elif parts[0] != "GET":
+                status, body = HTTPStatus.METHOD_NOT_ALLOWED, json.dumps({"error": "only GET"})
+            else:
+                try:
+                    status, body = await self.handle(parts[1])
+                except Exception as exc:  # keep serving; report the failure to this client
+                    status, body = HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": repr(exc)})
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+        """Load the data, then serve until cancelled."""
+        await self.snapshot()
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the Dune sales breakdowns over HTTP.")
+    parser.add_argument("--source", help="CSV export (default: $DUNE_SALES_CSV or the bundled file)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    parser.add_argument("--ttl", type=float, default=CACHE_TTL, help="seconds a cached answer stays valid")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        service = SalesService(args.source, args.cache_size, args.ttl)
+        print(f"serving {service.path} on http://{args.host}:{args.port}")
+        await service.serve(args.host, args.port)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
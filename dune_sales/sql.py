@@ -0,0 +1,228 @@
+"""Embedded analytical SQL backend for the sales data.
+
+:class:`SalesDB` loads the export once into a local database file with
+every derived column materialized, and answers the EDA's breakdowns as
+parameterized SQL, returning only the small result as a frame.
+
+* With DuckDB installed (``pip install duckdb``) the CSV is parsed and
+  enriched inside DuckDB: multi-threaded, spilling to disk when the data
+  does not fit in memory.
+* Otherwise the standard-library SQLite backend is used, loaded chunk by
+  chunk through the pandas pipeline.
+
+The source file's digest is stored with the table, so reopening the same
+database file skips the load while the export is unchanged.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .aggregates import loss_share
+from .cache import file_digest
+from .clean import KNOWN_FIXES
+from .features import AGE_EDGES, AGE_LABELS, PIPELINE_VERSION, enrich
+from .load import CATEGORY_COLUMNS, DEFAULT_CHUNKSIZE, iter_chunks, resolve_path
+
+#: Columns that may appear as a dimension or filter in a query.
+DIMENSIONS = (*CATEGORY_COLUMNS, "age_group", "year", "month", "month_name",
+              "quarter", "profit_label")
+
+MEASURES = ("cost", "revenue", "profit")
+
+INDEXED = ("State", "Sales Person", "year", "month")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _ident(name: str) -> str:
+    """Quote a column name after checking it against the whitelist."""
+    if name not in DIMENSIONS + MEASURES:
+        raise ValueError(f"unknown column {name!r}")
+    return _quote(name)
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _fixed(col: str) -> str:
+    fixes = KNOWN_FIXES.get(col)
+    if not fixes:
+        return _quote(col)
+    cases = " ".join(f"WHEN {_quote(col)} = {_literal(bad)} THEN {_literal(good)}"
+                     for bad, good in fixes.items())
+    return f"CASE {cases} ELSE {_quote(col)} END"
+
+
+def _age_case() -> str:
+    whens = " ".join(f"WHEN Customer_Age <= {edge} THEN {_literal(label)}"
+                     for edge, label in zip(AGE_EDGES, AGE_LABELS))
+    return f"CASE {whens} ELSE {_literal(AGE_LABELS[-1])} END"
+
+
+def _duckdb_load_sql(path: Path) -> str:
+    raw = ["Date", *CATEGORY_COLUMNS, "Customer_Age", "Quantity", "Unit_Cost", "Unit_Price"]
+    not_null = " AND ".join(f"{_quote(c)} IS NOT NULL" for c in raw)
+    categories = ",\n  ".join(f"{_fixed(c)} AS {_quote(c)}" for c in CATEGORY_COLUMNS)
+    return f"""
+CREATE OR REPLACE TABLE sales AS
+WITH raw AS (
+  SELECT * REPLACE (strptime(Date, '%d-%b-%y')::DATE AS Date)
+  FROM read_csv({_literal(path)}, header = true, types = {{'Date': 'VARCHAR'}})
+  WHERE {not_null}
+), base AS (
+  SELECT Date,
+  {categories},
+  Customer_Age::SMALLINT AS Customer_Age, Quantity::SMALLINT AS Quantity,
+  Unit_Cost::DOUBLE AS Unit_Cost, Unit_Price::DOUBLE AS Unit_Price,
+  year(Date) AS year, month(Date) AS month, monthname(Date) AS month_name,
+  quarter(Date) AS quarter,
+  {_age_case()} AS age_group,
+  Quantity * Unit_Cost AS cost, Quantity * Unit_Price AS revenue
+  FROM raw
+)
+SELECT *, revenue - cost AS profit,
+  CASE WHEN revenue - cost >= 0 THEN 'Profit' ELSE 'Loss' END AS profit_label
+FROM base
+"""
+
+
+class SalesDB:
+    """Enriched sales table in an embedded database.
+
+    *database* is a file path (reused across runs) or ``":memory:"``;
+    *backend* is ``"duckdb"``, ``"sqlite"`` or ``None`` to prefer DuckDB when
+    it is installed.
+    """
+
+    def __init__(self, database: str | os.PathLike = ":memory:", backend: str | None = None):
+        try:
+            import duckdb
+        except ImportError:
+            duckdb = None
+        if backend is None:
+            backend = "sqlite" if duckdb is None else "duckdb"
+        self.backend = backend
+        if backend == "duckdb":
+            if duckdb is None:
+                raise ImportError("the duckdb backend needs duckdb: pip install duckdb")
+            self.con = duckdb.connect(str(database))
+        elif backend == "sqlite":
+            self.con = sqlite3.connect(str(database))
+        else:
+            raise ValueError(f"unknown backend {backend!r}")
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self) -> "SalesDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def query(self, sql: str, params: list | tuple = ()) -> pd.DataFrame:
+        """Run *sql* with ``?`` placeholders bound to *params*."""
+        if self.backend == "duckdb":
+            return self.con.execute(sql, list(params)).df()
+        return pd.read_sql_query(sql, self.con, params=list(params))
+
+    def _source_version(self) -> str | None:
+        try:
+            rows = self.query("SELECT value FROM meta WHERE key = 'source'")
+        except Exception:  # no meta table yet; the error type differs per backend
+            return None
+        return rows["value"].iloc[0] if len(rows) else None
+
+    def load(self, path: str | os.PathLike | None = None, force: bool = False,
+             chunksize: int = DEFAULT_CHUNKSIZE) -> bool:
+        """Load and enrich the export unless the stored copy is current.
+
+        Returns ``True`` when the table was (re)built.
+        """
+        path = resolve_path(path).resolve()
+        version = f"{file_digest(path)}:{PIPELINE_VERSION}"
+        if not force and self._source_version() == version:
+            return False
+        if self.backend == "duckdb":
+            self.con.execute(_duckdb_load_sql(path))
+        else:
+            self._load_sqlite(path, chunksize)
+        self.con.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.con.execute("DELETE FROM meta WHERE key = 'source'")
+        self.con.execute("INSERT INTO meta VALUES ('source', ?)", [version])
+        if self.backend == "sqlite":
+            self.con.commit()
+        return True
+
+    def _load_sqlite(self, path: Path, chunksize: int) -> None:
+        self.con.execute("DROP TABLE IF EXISTS sales")
+        for chunk in iter_chunks(path, chunksize):
+            chunk = enrich(chunk)
+            chunk["Date"] = chunk["Date"].dt.strftime("%Y-%m-%d")
+            chunk = chunk.astype({c: str for c in chunk.columns
+                                  if isinstance(chunk[c].dtype, pd.CategoricalDtype)})
+            chunk.to_sql("sales", self.con, if_exists="append", index=False)
+        for col in INDEXED:
+            name = "idx_sales_" + col.replace(" ", "_")
+            self.con.execute(f"CREATE INDEX IF NOT EXISTS {name} ON sales ({_ident(col)})")
+
+    # -- the EDA's breakdowns ---------------------------------------------
+
+    @staticmethod
+    def _where(filters: dict[str, Any]) -> tuple[str, list]:
+        if not filters:
+            return "", []
+        clauses = [f"{_ident(col)} = ?" for col in filters]
+        return " WHERE " + " AND ".join(clauses), list(filters.values())
+
+    def totals(self, *dims: str, measures=MEASURES, **filters: Any) -> pd.DataFrame:
+        """``groupby(dims)[measures].sum()`` plus a ``count``, optionally filtered by equality."""
+        keys = ", ".join(_ident(d) for d in dims)
+        columns = [_ident(d) for d in dims]
+        columns += [f"SUM({_ident(m)}) AS {_ident(m)}" for m in measures]
+        columns.append("COUNT(*) AS count")
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(columns)} FROM sales{where}"
+        if dims:
+            sql += f" GROUP BY {keys} ORDER BY {keys}"
+        out = self.query(sql, params)
+        return out.set_index(list(dims)) if dims else out
+
+    def profit_by(self, dim: str, **filters: Any) -> pd.Series:
+        """``df.groupby(dim)['profit'].sum()``."""
+        return self.totals(dim, measures=("profit",), **filters)["profit"]
+
+    def value_counts(self, dim: str, **filters: Any) -> pd.Series:
+        """``df[dim].value_counts()``."""
+        where, params = self._where(filters)
+        sql = (f"SELECT {_ident(dim)}, COUNT(*) AS count FROM sales{where} "
+               f"GROUP BY {_ident(dim)} ORDER BY count DESC")
+        return self.query(sql, params).set_index(dim)["count"]
+
+    def pivot(self, index: str, columns: str, values: str = "profit", **filters: Any) -> pd.DataFrame:
+        """``df.pivot_table(values=values, index=index, columns=columns, aggfunc='sum')``."""
+        long = self.totals(index, columns, measures=(values,), **filters)
+        return long[values].unstack(columns)
+
+    def monthly_profit(self, **filters: Any) -> pd.DataFrame:
+        return self.pivot("year", "month", **filters)
+
+    def gender_age_profit(self, **filters: Any) -> pd.DataFrame:
+        return self.pivot("age_group", "Customer_Gender", **filters)
+
+    def category_metrics(self, **filters: Any) -> pd.DataFrame:
+        """Cost, revenue and profit per ``Product_Category`` in melted layout."""
+        wide = self.totals("Product_Category", **filters).drop(columns="count").reset_index()
+        return pd.melt(wide, id_vars="Product_Category", var_name="Metric", value_name="Total")
+
+    def loss_share(self, **filters: Any) -> float:
+        """Share of transactions with ``profit_label == 'Loss'``."""
+        return loss_share(self.value_counts("profit_label", **filters))
@@ -0,0 +1,303 @@
+"""Streaming, mergeable replacements for ``describe()`` and ``corr()``.
+
+Everything here is fed chunk by chunk and can be merged with a summary of
+another chunk or partition, so the summary table and the correlation
+heatmap work on files larger than memory.
+
+* :class:`NumericSummary` keeps exact count, mean, variance, min and max per
+  column (Chan et al.'s pairwise update) and a co-moment matrix for the
+  Pearson correlation, plus a :class:`TDigest` per column for quartiles.
+* :class:`CategoricalSummary` keeps exact counts, a :class:`DistinctSketch`
+  for ``unique`` and a :class:`CountMinSketch` with a bounded candidate set
+  for ``top``/``freq``.
+
+The correlation uses rows complete in every tracked column, whereas
+``DataFrame.corr`` uses pairwise-complete rows; after ``dropna`` (as in the
+EDA) the two agree.
+"""
+from __future__ import annotations
+
+import os
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .features import enrich
+from .load import DEFAULT_CHUNKSIZE, iter_chunks
+
+NUMERIC_COLUMNS = ("Customer_Age", "Quantity", "Unit_Cost", "Unit_Price",
+                   "year", "month", "quarter", "cost", "revenue", "profit")
+
+CATEGORICAL_COLUMNS = ("Customer", "Sales Person", "Customer_Gender", "State",
+                       "Product_Category", "Sub_Category", "Payment Option")
+
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest with the ``k1`` scale function)."""
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        # k1(q) = δ/2π · asin(2q − 1): narrow clusters at the tails, wide in the middle.
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        _, bucket = np.unique(bucket, return_inverse=True)
+        w = np.bincount(bucket, weights=weights)
+        self.means = np.bincount(bucket, weights=means * weights) / w
+        self.weights = w
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        out = TDigest(self.compression)
+        out.min, out.max = min(self.min, other.min), max(self.max, other.max)
+        if len(self.weights) or len(other.weights):
+            out._compress(np.concatenate([self.means, other.means]),
+                          np.concatenate([self.weights, other.weights]))
+        return out
+
+    def quantile(self, q: float | Sequence[float]) -> np.ndarray:
+        if not len(self.weights):
+            return np.full(np.shape(q), np.nan)
+        cum = np.cumsum(self.weights)
+        mid = cum - self.weights / 2
+        xs = np.concatenate([[0], mid, [cum[-1]]])
+        ys = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * cum[-1], xs, ys)
+
+
+def _hash(values: np.ndarray, key: int) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object), hash_key=f"{key:016d}")
+
+
+class CountMinSketch:
+    """Approximate frequency table; estimates never under-count."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _index(self, values: np.ndarray) -> np.ndarray:
+        return np.vstack([_hash(values, d) % self.width for d in range(self.depth)]).astype(np.int64)
+
+    def add(self, values: np.ndarray, counts: np.ndarray) -> None:
+        idx = self._index(values)
+        for d in range(self.depth):
+            np.add.at(self.table[d], idx[d], counts)
+
+    def estimate(self, values: np.ndarray) -> np.ndarray:
+        idx = self._index(values)
+        return np.min([self.table[d, idx[d]] for d in range(self.depth)], axis=0)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        out = CountMinSketch(self.width, self.depth)
+        out.table = self.table + other.table
+        return out
+
+
+class DistinctSketch:
+    """K-minimum-values estimate of the number of distinct values (exact below *k*)."""
+
+    def __init__(self, k: int = 1024):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values: np.ndarray) -> None:
+        self.hashes = np.unique(np.concatenate([self.hashes, _hash(values, 0)]))[:self.k]
+
+    def merge(self, other: "DistinctSketch") -> "DistinctSketch":
+        out = DistinctSketch(self.k)
+        out.hashes = np.unique(np.concatenate([self.hashes, other.hashes]))[:self.k]
+        return out
+
+    def estimate(self) -> int:
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int(round((self.k - 1) * 2.0 ** 64 / float(self.hashes[-1])))
+
+
+class NumericSummary:
+    """Mergeable count/mean/variance/min/max, quartiles and correlation of *columns*."""
+
+    def __init__(self, columns: Sequence[str] = NUMERIC_COLUMNS, compression: float = 200):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        self.digests = [TDigest(compression) for _ in range(k)]
+        # Co-moments over rows complete in every column.
+        self.rows = 0
+        self.row_mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    @staticmethod
+    def _combine(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean_b - mean_a
+            mean = np.where(n > 0, mean_a + delta * n_b / n, 0.0)
+            m2 = m2_a + m2_b + np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+        return n, mean, m2
+
+    def update(self, df: pd.DataFrame) -> None:
+        x = df[self.columns].to_numpy(dtype=float)
+        present = ~np.isnan(x)
+        n_b = present.sum(axis=0).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = np.where(n_b > 0, np.nansum(x, axis=0) / n_b, 0.0)
+        m2_b = np.nansum((x - mean_b) ** 2, axis=0)
+        self.count, self.mean, self.m2 = self._combine(self.count, self.mean, self.m2,
+                                                       n_b, mean_b, m2_b)
+        if present.any():
+            self.min = np.fmin(self.min, np.where(present, x, np.inf).min(axis=0))
+            self.max = np.fmax(self.max, np.where(present, x, -np.inf).max(axis=0))
+        for j, digest in enumerate(self.digests):
+            digest.update(x[:, j])
+
+        complete = x[present.all(axis=1)]
+        if len(complete):
+            rows_b = len(complete)
+            row_mean_b = complete.mean(axis=0)
+            centered = complete - row_mean_b
+            self._merge_comoment(rows_b, row_mean_b, centered.T @ centered)
+
+    def _merge_comoment(self, rows_b, row_mean_b, comoment_b) -> None:
+        n = self.rows + rows_b
+        delta = row_mean_b - self.row_mean
+        self.comoment = (self.comoment + comoment_b
+                         + np.outer(delta, delta) * self.rows * rows_b / n)
+        self.row_mean = self.row_mean + delta * rows_b / n
+        self.rows = n
+
+    def merge(self, other: "NumericSummary") -> "NumericSummary":
+        if self.columns != other.columns:
+            raise ValueError("summaries must track the same columns to be merged")
+        out = NumericSummary(self.columns)
+        out.count, out.mean, out.m2 = self._combine(self.count, self.mean, self.m2,
+                                                    other.count, other.mean, other.m2)
+        out.min, out.max = np.fmin(self.min, other.min), np.fmax(self.max, other.max)
+        out.digests = [a.merge(b) for a, b in zip(self.digests, other.digests)]
+        out.rows, out.row_mean, out.comoment = self.rows, self.row_mean, self.comoment
+        if other.rows:
+            out._merge_comoment(other.rows, other.row_mean, other.comoment)
+        return out
+
+    def describe(self) -> pd.DataFrame:
+        """Same layout as ``df.describe()``; quartiles are t-digest estimates."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.where(self.count > 1, self.m2 / (self.count - 1), np.nan))
+        quartiles = np.array([d.quantile([0.25, 0.5, 0.75]) for d in self.digests]).T
+        empty = self.count == 0
+        data = np.vstack([self.count, np.where(empty, np.nan, self.mean), std,
+                          np.where(empty, np.nan, self.min), *quartiles,
+                          np.where(empty, np.nan, self.max)])
+        return pd.DataFrame(data, columns=self.columns,
+                            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+
+    def corr(self) -> pd.DataFrame:
+        """Pearson correlation matrix, like ``df.corr(numeric_only=True)``."""
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class CategoricalSummary:
+    """Mergeable ``describe(include='category')``: count, unique, top and freq.
+
+    ``unique`` is exact up to the distinct sketch's *k* and ``freq`` is a
+    count-min estimate (an upper bound) for the best of *candidates* values.
+    """
+
+    def __init__(self, columns: Sequence[str] = CATEGORICAL_COLUMNS, candidates: int = 32,
+                 width: int = 2048, depth: int = 4, k: int = 1024):
+        self.columns = list(columns)
+        self.candidates = candidates
+        self.count = dict.fromkeys(self.columns, 0)
+        self.sketches = {c: CountMinSketch(width, depth) for c in self.columns}
+        self.distinct = {c: DistinctSketch(k) for c in self.columns}
+        self.heavy: dict[str, np.ndarray] = {c: np.empty(0, dtype=object) for c in self.columns}
+
+    def _prune(self, col: str, values: np.ndarray) -> None:
+        values = pd.unique(values)
+        est = self.sketches[col].estimate(values)
+        keep = np.argsort(-est, kind="stable")[:self.candidates]
+        self.heavy[col] = values[keep]
+
+    def update(self, df: pd.DataFrame) -> None:
+        for col in self.columns:
+            counts = df[col].value_counts(dropna=True)
+            counts = counts[counts > 0]
+            values = counts.index.to_numpy(dtype=object)
+            self.count[col] += int(counts.sum())
+            self.sketches[col].add(values, counts.to_numpy())
+            self.distinct[col].update(values)
+            self._prune(col, np.concatenate([self.heavy[col], values]))
+
+    def merge(self, other: "CategoricalSummary") -> "CategoricalSummary":
+        if self.columns != other.columns:
+            raise ValueError("summaries must track the same columns to be merged")
+        out = CategoricalSummary(self.columns, self.candidates)
+        for col in self.columns:
+            out.count[col] = self.count[col] + other.count[col]
+            out.sketches[col] = self.sketches[col].merge(other.sketches[col])
+            out.distinct[col] = self.distinct[col].merge(other.distinct[col])
+            out._prune(col, np.concatenate([self.heavy[col], other.heavy[col]]))
+        return out
+
+    def describe(self) -> pd.DataFrame:
+        """Same layout as ``df.describe(include=['category'])``."""
+        out = {}
+        for col in self.columns:
+            heavy = self.heavy[col]
+            if len(heavy):
+                est = self.sketches[col].estimate(heavy)
+                top, freq = heavy[int(np.argmax(est))], int(est.max())
+            else:
+                top, freq = np.nan, np.nan
+            out[col] = [self.count[col], self.distinct[col].estimate(), top, freq]
+        return pd.DataFrame(out, index=["count", "unique", "top", "freq"], dtype=object)
+
+
+def summarize(chunks: Iterable[pd.DataFrame],
+              numeric: Sequence[str] = NUMERIC_COLUMNS,
+              categorical: Sequence[str] = CATEGORICAL_COLUMNS
+              ) -> tuple[NumericSummary, CategoricalSummary]:
+    """Fold *chunks* into a numeric and a categorical summary."""
+    num, cat = NumericSummary(numeric), CategoricalSummary(categorical)
+    for chunk in chunks:
+        num.update(chunk)
+        cat.update(chunk)
+    return num, cat
+
+
+def summarize_file(path: str | os.PathLike | None = None,
+                   chunksize: int = DEFAULT_CHUNKSIZE) -> tuple[NumericSummary, CategoricalSummary]:
+    """Summaries of the cleaned and enriched export, read chunk by chunk."""
+    return summarize(enrich(c) for c in iter_chunks(path, chunksize))
@@ -0,0 +1,149 @@
+"""Synthetic sales exports with the real file's schema and distributions.
+
+The shipped export has only ~35k rows, too few to measure anything at
+production scale.  :class:`SalesModel` learns from the real file
+
+* the joint frequency of the categorical columns (Customer, Sales Person,
+  Gender, State, Product_Category, Sub_Category, Payment Option) as a table
+  of observed combinations — sampling from it keeps e.g. each sales
+  person's states and each sub-category's product category consistent;
+* the numeric columns conditionally on that combination: each synthetic
+  row copies ``Customer_Age``, ``Quantity``, ``Unit_Cost`` and
+  ``Unit_Price`` from a random real row with the same combination, so
+  prices stay tied to the sub-category and cost stays tied to price;
+* the marginal distribution of ``Date`` and each column's missing-value
+  rate, so the cleaning stage has the same work to do.
+
+and writes any number of rows in bounded memory::
+
+    python -m dune_sales.synthetic --rows 10M --out data/sales_10M.csv
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .load import CATEGORY_COLUMNS, DEFAULT_CHUNKSIZE, load_raw
+
+#: Numeric columns drawn together from a real row with the same categories.
+NUMERIC_COLUMNS = ("Customer_Age", "Quantity", "Unit_Cost", "Unit_Price")
+
+#: Prices in the export are in whole cents.  The loader reads them as
+#: ``float32``, so donors are rounded back to this many decimals after
+#: widening; otherwise ``6.67`` would be written as ``6.670000076293945``.
+PRICE_DECIMALS = 2
+
+#: Dates are written back in the export's own format.
+CSV_DATE_FORMAT = "%d-%b-%y"
+
+_SUFFIXES = {"K": 10**3, "M": 10**6, "B": 10**9}
+
+
+def parse_rows(text: str) -> int:
+    """``"1M"`` -> 1_000_000; plain integers and ``_`` separators are accepted too."""
+    text = text.strip().upper().replace("_", "")
+    if text and text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+class SalesModel:
+    """Empirical generative model of the sales export; build it with :meth:`fit`."""
+
+    def __init__(self, columns: list[str], combos: pd.DataFrame, weights: np.ndarray,
+                 donors: pd.DataFrame, starts: np.ndarray, sizes: np.ndarray,
+                 dates: pd.Index, date_weights: np.ndarray, missing: pd.Series):
+        self.columns = columns
+        self.combos = combos
+        self.weights = weights
+        self.donors = donors
+        self.starts = starts
+        self.sizes = sizes
+        self.dates = dates
+        self.date_weights = date_weights
+        self.missing = missing
+
+    @classmethod
+    def fit(cls, raw: pd.DataFrame) -> "SalesModel":
+        """Learn from the raw export as read by :func:`~dune_sales.load.load_raw`."""
+        missing = raw.isna().mean()
+        cats = list(CATEGORY_COLUMNS)
+        complete = raw.dropna(subset=cats + list(NUMERIC_COLUMNS))
+        combo_id = complete.groupby(cats, observed=True, sort=True).ngroup().to_numpy()
+        order = np.argsort(combo_id, kind="stable")
+        donors = (complete[list(NUMERIC_COLUMNS)].iloc[order].reset_index(drop=True)
+                  .astype({"Customer_Age": "int64", "Quantity": "int64",
+                           "Unit_Cost": "float64", "Unit_Price": "float64"})
+                  .round({"Unit_Cost": PRICE_DECIMALS, "Unit_Price": PRICE_DECIMALS}))
+        sizes = np.bincount(combo_id)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        combos = (complete[cats].iloc[order].drop_duplicates()
+                  .astype(object).reset_index(drop=True))
+
+        dates = raw["Date"].dropna()
+        dates = pd.to_datetime(dates.astype(str), format=CSV_DATE_FORMAT).value_counts()
+        return cls(list(raw.columns), combos, sizes / sizes.sum(), donors, starts, sizes,
+                   dates.index, (dates / dates.sum()).to_numpy(), missing)
+
+    @classmethod
+    def fit_file(cls, path: str | os.PathLike | None = None) -> "SalesModel":
+        return cls.fit(load_raw(path))
+
+    def sample(self, rows: int, rng: np.random.Generator) -> pd.DataFrame:
+        """Draw *rows* synthetic raw rows (with missing values) in the export's column order."""
+        combo = rng.choice(len(self.weights), size=rows, p=self.weights)
+        donor = self.starts[combo] + (rng.random(rows) * self.sizes[combo]).astype(np.int64)
+        out = {col: self.combos[col].to_numpy()[combo] for col in self.combos.columns}
+        for col in NUMERIC_COLUMNS:
+            out[col] = self.donors[col].to_numpy()[donor]
+        out["Date"] = self.dates[rng.choice(len(self.dates), size=rows, p=self.date_weights)]
+        df = pd.DataFrame(out)[self.columns]
+        for col, rate in self.missing.items():
+            if rate > 0:
+                holes = rng.random(rows) < rate
+                if holes.any():
+                    df[col] = df[col].where(~holes)
+        return df
+
+    def generate(self, rows: int, seed: int = 0,
+                 chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+        """Yield *rows* synthetic rows in chunks; the output depends only on *seed* and *chunksize*."""
+        rng = np.random.default_rng(seed)
+        for start in range(0, rows, chunksize):
+            yield self.sample(min(chunksize, rows - start), rng)
+
+    def write_csv(self, path: str | os.PathLike, rows: int, seed: int = 0,
+                  chunksize: int = DEFAULT_CHUNKSIZE) -> Path:
+        """Write a synthetic export of *rows* rows to *path* (atomically)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", newline="") as fh:
+            for i, chunk in enumerate(self.generate(rows, seed, chunksize)):
+                chunk = chunk.assign(Date=chunk["Date"].dt.strftime(CSV_DATE_FORMAT))
+                chunk = chunk.astype({"Customer_Age": "Int64", "Quantity": "Int64"})
+                chunk.to_csv(fh, header=i == 0, index=False)
+        os.replace(tmp, path)
+        return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic Dune sales export.")
+    parser.add_argument("--rows", default="1M", help="row count, e.g. 1M, 10M, 100M")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--source", help="real export to learn from (default: the bundled file)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows = parse_rows(args.rows)
+    path = SalesModel.fit_file(args.source).write_csv(args.out, rows, args.seed)
+    print(f"wrote {rows:,} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
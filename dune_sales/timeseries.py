@@ -0,0 +1,207 @@
+"""Dense daily time series of the money measures, with cheap calendar rollups.
+
+The notebook's trend section regroups the full frame twice — a
+``sns.lineplot(x='month', y='profit', hue='year')`` over the raw rows and
+a ``pivot_table(index='year', columns='month')`` — and never uses the
+``quarter`` it extracts.  :class:`DailySeries` resamples the transactions
+once into a ``(days, labels, measures)`` array of sums (plus a transaction
+count per day and label), covering every calendar day between the first
+and last sale.  Everything else works on that array:
+
+* :meth:`DailySeries.rollup` — daily/monthly/quarterly/yearly totals or means
+  (``np.add.reduceat`` over contiguous day ranges);
+* :meth:`DailySeries.rolling` — trailing windows via cumulative sums;
+* :meth:`DailySeries.yoy` — year-over-year deltas;
+* :meth:`DailySeries.pivot` — the notebook's year × month (or quarter) table.
+
+::
+
+    trend = DailySeries.from_frame(df)                  # all sales
+    trend.pivot('profit')                               # == the notebook's pivot_table
+    by_state = DailySeries.from_frame(df, dim='State')  # one column per state
+    by_state.rollup('Q', 'revenue')
+    by_state.rolling(28, measure='profit')
+"""
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import MEASURES, encode
+
+#: Rollup frequencies: day, month, quarter, year.
+FREQS = ("D", "M", "Q", "Y")
+
+
+class DailySeries:
+    """Per-day sums of *measures* and transaction counts, optionally split by one dimension."""
+
+    def __init__(self, days: pd.DatetimeIndex, labels: pd.Index | None, values: np.ndarray,
+                 counts: np.ndarray, measures: Sequence[str], dim: str | None = None):
+        self.days = days
+        self.labels = labels
+        self.values = values
+        self.counts = counts
+        self.measures = tuple(measures)
+        self.dim = dim
+
+    def __repr__(self) -> str:
+        split = f", by {self.dim} ({len(self.labels)} labels)" if self.dim else ""
+        return (f"<DailySeries {self.days[0].date()}..{self.days[-1].date()} "
+                f"({len(self.days)} days){split}, {int(self.counts.sum()):,} rows>")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dim: str | None = None,
+                   measures: Sequence[str] = MEASURES) -> "DailySeries":
+        """Resample an enriched frame (``Date`` parsed) into daily sums."""
+        day = df['Date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        if dim is None:
+            codes, labels = np.zeros(len(df), dtype=np.int64), None
+        else:
+            codes, labels = encode(df[dim])
+        keep = (codes >= 0) & ~np.isnat(day)
+        day, codes = day[keep], codes[keep]
+        if not len(day):
+            raise ValueError("no dated rows to resample")
+        start = day.min()
+        n_days = int((day.max() - start).astype(np.int64)) + 1
+        width = 1 if labels is None else len(labels)
+        cell = (day - start).astype(np.int64) * width + codes
+        size = n_days * width
+        values = np.empty((n_days, width, len(measures)))
+        for j, m in enumerate(measures):
+            weights = df[m].to_numpy(dtype=np.float64)[keep]
+            values[:, :, j] = np.bincount(cell, weights=weights, minlength=size).reshape(n_days, width)
+        counts = np.bincount(cell, minlength=size).reshape(n_days, width)
+        days = pd.date_range(pd.Timestamp(start), periods=n_days, freq='D')
+        return cls(days, labels, values, counts, measures, dim)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], dim: str | None = None,
+                    measures: Sequence[str] = MEASURES) -> "DailySeries":
+        """Resample enriched chunks one at a time and merge the results."""
+        result = None
+        for chunk in chunks:
+            part = cls.from_frame(chunk, dim, measures)
+            result = part if result is None else result.merge(part)
+        if result is None:
+            raise ValueError("no chunks to resample")
+        return result
+
+    def _aligned(self, days: pd.DatetimeIndex, labels: pd.Index | None) -> tuple[np.ndarray, np.ndarray]:
+        rows = days.get_indexer(self.days)
+        cols = [0] if labels is None else labels.get_indexer(self.labels)
+        width = 1 if labels is None else len(labels)
+        values = np.zeros((len(days), width, len(self.measures)))
+        counts = np.zeros((len(days), width), dtype=np.int64)
+        values[np.ix_(rows, cols)] = self.values
+        counts[np.ix_(rows, cols)] = self.counts
+        return values, counts
+
+    def merge(self, other: "DailySeries") -> "DailySeries":
+        if (self.dim, self.measures) != (other.dim, other.measures):
+            raise ValueError("can only merge series with the same dimension and measures")
+        days = pd.date_range(min(self.days[0], other.days[0]), max(self.days[-1], other.days[-1]),
+                             freq='D')
+        labels = None if self.dim is None else self.labels.union(other.labels)
+        a_values, a_counts = self._aligned(days, labels)
+        b_values, b_counts = other._aligned(days, labels)
+        return DailySeries(days, labels, a_values + b_values, a_counts + b_counts,
+                           self.measures, self.dim)
+
+    # -- rollups ----------------------------------------------------------
+
+    def _measure(self, measure: str) -> int:
+        try:
+            return self.measures.index(measure)
+        except ValueError:
+            raise KeyError(f"{measure!r} is not one of {self.measures}") from None
+
+    def _periods(self, freq: str) -> tuple[pd.PeriodIndex, np.ndarray]:
+        """Periods covering the days and the index of each period's first day."""
+        if freq not in FREQS:
+            raise ValueError(f"freq must be one of {FREQS}, got {freq!r}")
+        periods = self.days.to_period(freq)
+        codes = periods.asi8
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        return periods[starts], starts
+
+    def _frame(self, data: np.ndarray, index: pd.Index) -> pd.DataFrame | pd.Series:
+        if self.dim is None:
+            return pd.Series(data[:, 0], index=index)
+        return pd.DataFrame(data, index=index, columns=pd.Index(self.labels, name=self.dim))
+
+    def _sums(self, freq: str, measure: str) -> tuple[pd.PeriodIndex, np.ndarray, np.ndarray]:
+        periods, starts = self._periods(freq)
+        sums = np.add.reduceat(self.values[:, :, self._measure(measure)], starts, axis=0)
+        counts = np.add.reduceat(self.counts, starts, axis=0)
+        return periods, sums, counts
+
+    def rollup(self, freq: str = "M", measure: str = "profit",
+               how: str = "sum") -> pd.DataFrame | pd.Series:
+        """Totals (``how="sum"``) or per-transaction means (``how="mean"``) per period.
+
+        Periods without transactions are 0 for sums and NaN for means.
+        """
+        periods, sums, counts = self._sums(freq, measure)
+        if how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sums = np.where(counts > 0, sums / counts, np.nan)
+        elif how != "sum":
+            raise ValueError(f"how must be 'sum' or 'mean', got {how!r}")
+        return self._frame(sums, periods)
+
+    def rolling(self, window: int, freq: str = "D", measure: str = "profit",
+                how: str = "sum") -> pd.DataFrame | pd.Series:
+        """Trailing *window*-period sums or means; the first ``window - 1`` periods are NaN."""
+        periods, sums, counts = self._sums(freq, measure)
+        zero = np.zeros((1,) + sums.shape[1:])
+        cs = np.concatenate([zero, np.cumsum(sums, axis=0)])
+        cc = np.concatenate([zero, np.cumsum(counts, axis=0)])
+        out = np.full(sums.shape, np.nan)
+        if window <= len(sums):
+            win_sums = cs[window:] - cs[:-window]
+            if how == "mean":
+                win_counts = cc[window:] - cc[:-window]
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    win_sums = np.where(win_counts > 0, win_sums / win_counts, np.nan)
+            elif how != "sum":
+                raise ValueError(f"how must be 'sum' or 'mean', got {how!r}")
+            out[window - 1:] = win_sums
+        return self._frame(out, periods)
+
+    def yoy(self, freq: str = "M", measure: str = "profit",
+            pct: bool = False) -> pd.DataFrame | pd.Series:
+        """Change against the same period one year earlier (NaN where that is out of range).
+
+        With *pct* the change is relative to the absolute prior value, so a
+        move from a loss to a smaller loss reads as an improvement.
+        """
+        current = self.rollup(freq, measure)
+        earlier = (current.index.to_timestamp() - pd.DateOffset(years=1)).to_period(freq)
+        previous = current.reindex(earlier)
+        previous.index = current.index
+        delta = current - previous
+        return delta / previous.abs() if pct else delta
+
+    def pivot(self, measure: str = "profit", how: str = "sum",
+              columns: str = "month") -> pd.DataFrame:
+        """Year × month (or ``columns="quarter"``) table of an undivided series.
+
+        Matches ``df.pivot_table(values=measure, index='year', columns=columns,
+        aggfunc=how)``: periods without transactions are NaN.
+        """
+        if self.dim is not None:
+            raise ValueError("pivot needs a series without a dimension split")
+        freq = {"month": "M", "quarter": "Q"}[columns]
+        periods, sums, counts = self._sums(freq, measure)
+        values = sums[:, 0].astype(float)
+        if how == "mean":
+            values = values / np.where(counts[:, 0] > 0, counts[:, 0], 1)
+        values[counts[:, 0] == 0] = np.nan
+        part = periods.month if columns == "month" else periods.quarter
+        table = pd.Series(values, index=pd.MultiIndex.from_arrays(
+            [periods.year, part], names=["year", columns]))
+        return table.dropna().unstack(columns)